@@ -0,0 +1,18 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class PaperFormsConfig(AppConfig):
+    name = "paper_forms"
+
+    def ready(self):
+        # Register the Jinja2 extension only if django-jinja is actually
+        # used, so that other deployments don't import Jinja2 at all.
+        if any(
+            str(engine.get("BACKEND", "")).startswith("django_jinja.")
+            for engine in settings.TEMPLATES
+        ):
+            from django_jinja import library
+
+            from .jinja import PaperFormExtension
+            library.extension(PaperFormExtension)
@@ -0,0 +1,117 @@
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Iterator, Optional
+
+__all__ = ["AttrsBuilder"]
+
+
+class AttrsBuilder(MutableMapping):
+    """
+    Collects widget attributes from several layers without copying them.
+
+    Layers are read-only mappings; later layers take precedence. Writes and
+    removals are recorded by the builder itself. The `class` attribute is
+    kept as an ordered set of class names and joined back only when read.
+    """
+    __slots__ = ("_layers", "_attrs", "_removed", "_classes")
+
+    def __init__(self, *layers: Optional[Mapping]):
+        self._layers = tuple(layer for layer in layers if layer)
+        self._attrs: dict[str, Any] = {}
+        self._removed: set[str] = set()
+        self._classes: Optional[dict[str, None]] = None
+
+    def _lookup(self, key: str) -> Any:
+        try:
+            return self._attrs[key]
+        except KeyError:
+            pass
+
+        if key not in self._removed:
+            for layer in reversed(self._layers):
+                if key in layer:
+                    return layer[key]
+        raise KeyError(key)
+
+    @property
+    def classes(self) -> dict[str, None]:
+        if self._classes is None:
+            try:
+                value = self._lookup("class")
+            except KeyError:
+                value = None
+            self._classes = dict.fromkeys(value.split() if value else ())
+        return self._classes
+
+    def add_class(self, *class_names: str):
+        classes = self.classes
+        for class_name in class_names:
+            classes[class_name] = None
+
+    def remove_class(self, *class_names: str):
+        classes = self.classes
+        for class_name in class_names:
+            classes.pop(class_name, None)
+
+    def has_class(self, class_name: str) -> bool:
+        return class_name in self.classes
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "class" and self._classes is not None:
+            if not self._classes:
+                raise KeyError(key)
+            return " ".join(self._classes)
+        return self._lookup(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key == "class":
+            self._classes = None
+        self._removed.discard(key)
+        self._attrs[key] = value
+
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+
+        if key == "class":
+            self._classes = None
+        self._attrs.pop(key, None)
+        self._removed.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        if key == "class" and self._classes is not None:
+            return bool(self._classes)
+        try:
+            self._lookup(key)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.build())
+
+    def __len__(self) -> int:
+        return len(self.build())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.build()!r})"
+
+    def build(self) -> dict:
+        """
+        Returns the final attributes as a new dictionary.
+        """
+        attrs: dict[str, Any] = {}
+        for layer in self._layers:
+            attrs.update(layer)
+        attrs.update(self._attrs)
+
+        for key in self._removed:
+            attrs.pop(key, None)
+
+        if self._classes is not None:
+            if self._classes:
+                attrs["class"] = " ".join(self._classes)
+            else:
+                attrs.pop("class", None)
+        return attrs
@@ -1,15 +1,26 @@
 import datetime
-from typing import Any
+from typing import Any, Optional
 
 import django
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured
 from django.forms.boundfield import BoundField as _BoundField
 from django.forms.boundfield import BoundWidget
-from django.forms.widgets import Widget
+from django.forms.renderers import BaseRenderer
+from django.forms.widgets import ChoiceWidget, Widget
 from django.utils.functional import cached_property
+from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
 
+from .attrs import AttrsBuilder
+from .cache import make_fragment_key
+from .choices import ChoicesSource, is_same_choices, load_choices
 from .composer import BaseComposer
+from .session import RenderSession, get_render_session
+from .signals import Stopwatch, field_rendered
+from .utils import LazyContext
 
-__all__ = ["BoundField"]
+__all__ = ["BoundField", "get_bound_field"]
 
 
 class BoundField(_BoundField):
@@ -17,13 +28,20 @@ class BoundField(_BoundField):
         super().__init__(form, field, name)
         self.composer: BaseComposer = composer
 
+        # Time spent on the composer resolution. Reported by the
+        # `field_rendered` signal on the first render of the field.
+        self._composer_time: Optional[float] = None
+
     def as_widget(
         self,
         widget: Widget = None,
         attrs: dict = None,
         only_initial: bool = False,
-        extra_context: dict = None
+        extra_context: dict = None,
+        renderer: BaseRenderer = None
     ):
+        stopwatch = Stopwatch() if field_rendered.receivers else None
+
         widget = widget or self.widget
         if self.field.localize:
             widget.is_localized = True
@@ -42,27 +60,163 @@ class BoundField(_BoundField):
         else:
             value = self.value()
 
-        context = self.get_context(
-            widget,
-            name=self.html_initial_name if only_initial else self.html_name,
-            value=value,
+        name = self.html_initial_name if only_initial else self.html_name
+        renderer = renderer or self.session.renderer
+        template_name, template = self.composer.get_template(self.name, widget, renderer)
+        if stopwatch is not None:
+            stopwatch.lap("widget")
+
+        fragment_cache = self.composer.fragment_cache
+        cache_key = None
+        cache_hit = None
+        html = None
+        if fragment_cache is not None:
+            cache_key = self.get_fragment_cache_key(
+                widget,
+                template_name=template_name,
+                name=name,
+                value=value,
+                attrs=attrs,
+                extra_context=extra_context,
+            )
+            if cache_key is not None:
+                html = fragment_cache.get(cache_key)
+                cache_hit = html is not None
+                if cache_hit:
+                    html = mark_safe(html)
+
+        if html is None:
+            context = self.get_context(
+                widget,
+                name=name,
+                value=value,
+                attrs=attrs,
+                extra_context=extra_context,
+            )
+            context = self.composer.build_context(self.name, context, widget)
+            if stopwatch is not None:
+                stopwatch.lap("context")
+
+            if template is not None:
+                html = mark_safe(template.render(context).strip())
+            else:
+                html = widget._render(template_name, context, renderer)
+            if stopwatch is not None:
+                stopwatch.lap("render")
+
+            if cache_key is not None:
+                fragment_cache.set(cache_key, str(html))
+
+        if stopwatch is not None:
+            if self._composer_time is not None:
+                stopwatch.timings["composer"] = self._composer_time
+                self._composer_time = None
+
+            field_rendered.send(
+                sender=type(self.composer),
+                bound_field=self,
+                template_name=template_name,
+                timings=stopwatch.timings,
+                cache_hit=cache_hit,
+            )
+        return html
+
+    async def aas_widget(
+        self,
+        widget: Widget = None,
+        attrs: dict = None,
+        only_initial: bool = False,
+        extra_context: dict = None,
+        renderer: BaseRenderer = None
+    ):
+        widget = widget or self.widget
+        if self.form.is_bound:
+            # Validation may query the database (e.g. `ModelChoiceField`),
+            # so it must not run in the event loop.
+            await sync_to_async(lambda: self.form.errors)()
+        await self.aprepare_widget(widget)
+        return self.as_widget(
+            widget=widget,
             attrs=attrs,
+            only_initial=only_initial,
             extra_context=extra_context,
+            renderer=renderer,
         )
 
-        return widget._render(
-            template_name=self.composer.get_template_name(self.name, widget),
-            context=self.composer.build_context(self.name, context, widget),
-            renderer=self.composer.get_renderer(self.form),
+    async def aprepare_widget(self, widget: Widget):
+        """
+        Loads lazy choices (e.g. querysets of `ModelChoiceField`) of the widget
+        without blocking the event loop, so that the widget can be rendered
+        synchronously afterwards.
+        """
+        choices = getattr(widget, "choices", None)
+        if isinstance(choices, ChoicesSource):
+            if choices.expired:
+                await sync_to_async(choices.get)()
+        elif choices is not None and not isinstance(choices, (list, tuple)):
+            await sync_to_async(load_choices)(widget)
+
+    def get_fragment_cache_key(
+        self,
+        widget: Widget,
+        template_name: str,
+        name: str,
+        value: Any,
+        attrs: dict,
+        extra_context: dict = None
+    ) -> Optional[str]:
+        """
+        Returns the key of the rendered field in the fragment cache or `None`
+        if the field must not be cached. Only unbound forms without errors
+        and without instance-level `error_css_class`/`required_css_class`
+        are cached.
+        """
+        if self.form.is_bound or self.errors:
+            return None
+
+        if self.session.css_classes_cache is None:
+            return None
+
+        choices = None
+        if isinstance(widget, ChoiceWidget):
+            # Choices can be changed by the form or come from the database.
+            load_choices(widget)
+            choices = list(widget.choices)
+
+        form_class = type(self.form)
+        composer_class = type(self.composer)
+        return make_fragment_key(
+            f"{composer_class.__module__}.{composer_class.__qualname__}",
+            f"{form_class.__module__}.{form_class.__qualname__}",
+            self.name,
+            f"{type(widget).__module__}.{type(widget).__qualname__}",
+            widget.is_required,
+            widget.is_localized,
+            template_name,
+            name,
+            value,
+            attrs,
+            choices,
+            extra_context,
+            self.label,
+            self.help_text,
+            get_language(),
         )
 
     def build_widget_attrs(self, widget: Widget, attrs: dict = None) -> dict:
         attrs = attrs or {}
         attrs = super().build_widget_attrs(attrs, widget)
 
-        # Use the internal attributes of the widget.
-        attrs = widget.build_attrs(widget.attrs, attrs)
-        return self.composer.build_widget_attrs(self.name, attrs, widget)
+        if self.composer.attrs_builder:
+            # Use the internal attributes of the widget without copying them.
+            attrs = AttrsBuilder(widget.attrs, attrs)
+        else:
+            attrs = widget.build_attrs(widget.attrs, attrs)
+
+        attrs = self.composer.build_widget_attrs(self.name, attrs, widget)
+        if not isinstance(attrs, dict):
+            return attrs.build()
+        return attrs
 
     def get_context(
         self,
@@ -71,36 +225,77 @@ class BoundField(_BoundField):
         value: Any,
         attrs: dict = None,
         extra_context: dict = None
-    ) -> dict:
-        widget_context = widget.get_context(
-            name=name,
-            value=value,
-            attrs=attrs
-        )
-        extra_context = extra_context or {}
-        context = dict(widget_context, **extra_context)
+    ) -> LazyContext:
+        choice_renderer = self.composer.choice_renderer
+        if choice_renderer is not None and choice_renderer.supports(widget):
+            widget_context = choice_renderer.get_context(widget, name, value, attrs)
+        else:
+            widget_context = widget.get_context(
+                name=name,
+                value=value,
+                attrs=attrs
+            )
 
+        context = LazyContext(widget_context)
+        if extra_context:
+            context.update(extra_context)
+
+        # Computed on first access, so templates that do not use these
+        # variables do not pay for them (e.g. the form validation).
         if "label" not in context:
-            label = self.composer.get_label(self.name, widget)
-            if label is None:
-                label = self.label
-            context["label"] = label
+            context.set_lazy("label", lambda: self.get_label(widget))
 
         if "help_text" not in context:
-            help_text = self.composer.get_help_text(self.name, widget)
-            if help_text is None:
-                help_text = self.help_text
-            context["help_text"] = help_text
+            context.set_lazy("help_text", lambda: self.get_help_text(widget))
 
         if "css_classes" not in context:
-            extra_css_classes = self.composer.get_css_classes(self.name, widget)
-            context["css_classes"] = self.css_classes(extra_css_classes)
+            context.set_lazy("css_classes", lambda: self.css_classes(
+                self.composer.get_css_classes(self.name, widget)
+            ))
 
-        context["errors"] = self.errors
+        context.set_lazy("errors", lambda: self.errors)
 
         return context
 
+    def get_label(self, widget: Widget) -> str:
+        label = self.composer.get_label(self.name, widget)
+        if label is None:
+            label = self.label
+        return label
+
+    def get_help_text(self, widget: Widget) -> str:
+        help_text = self.composer.get_help_text(self.name, widget)
+        if help_text is None:
+            help_text = self.help_text
+        return help_text
+
     def css_classes(self, extra_classes=None):
+        index = bool(self.errors) << 1 | bool(self.field.required)
+
+        form_cache = self.session.css_classes_cache
+        if form_cache is None:
+            # Instance-level overrides can't be shared across the form class.
+            return self.build_css_classes(extra_classes, index)
+
+        try:
+            return form_cache[extra_classes][index]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable extra classes (e.g. a list).
+            return self.build_css_classes(extra_classes, index)
+
+        table = form_cache[extra_classes] = tuple(
+            self.build_css_classes(extra_classes, combination)
+            for combination in range(4)
+        )
+        return table[index]
+
+    def build_css_classes(self, extra_classes, index: int) -> str:
+        """
+        Builds the CSS classes of the field. The bits of `index` tell
+        whether the field has errors (2) and whether it is required (1).
+        """
         if hasattr(extra_classes, "split"):
             extra_classes = extra_classes.split()
 
@@ -112,18 +307,25 @@ class BoundField(_BoundField):
             if class_name not in seen and not seen.add(class_name)
         ]
 
-        if self.errors:
+        if index & 2:
             if self.composer.error_css_class:
                 extra_classes.append(self.composer.error_css_class)
             elif hasattr(self.form, "error_css_class"):
                 extra_classes.append(self.form.error_css_class)
-        if self.field.required:
+        if index & 1:
             if self.composer.required_css_class:
                 extra_classes.append(self.composer.required_css_class)
             elif hasattr(self.form, "required_css_class"):
                 extra_classes.append(self.form.required_css_class)
         return " ".join(extra_classes)
 
+    @cached_property
+    def session(self) -> RenderSession:
+        session = get_render_session(self.form)
+        if session.composer is self.composer:
+            return session
+        return RenderSession(self.form, self.composer)
+
     @cached_property
     def widget(self) -> Widget:
         widget = self.composer.get_widget(self.name)
@@ -133,16 +335,42 @@ class BoundField(_BoundField):
             extra_attrs = self.field.widget_attrs(widget)
             if extra_attrs:
                 widget.attrs.update(extra_attrs)
-            return widget
+        else:
+            widget = self.field.widget
 
-        return self.field.widget
+        choices = self.composer.get_choices(self.name)
+        if choices is not None:
+            if not is_same_choices(getattr(self.field, "choices", None), choices):
+                # Submitted values are validated against the choices of the field.
+                raise ImproperlyConfigured(
+                    "{}.choices[{!r}] differ from the choices of the form field. "
+                    "Pass the same ChoicesSource to the field.".format(
+                        type(self.composer).__name__,
+                        self.name
+                    )
+                )
+            widget.choices = choices
+        return widget
 
     @cached_property
     def subwidgets(self) -> list[BoundWidget]:
         # Use self.widget instead of self.field.widget
         id_ = self.widget.attrs.get("id") or self.auto_id
         attrs = {"id": id_} if id_ else {}
-        attrs = self.build_widget_attrs(attrs)
+        attrs = self.build_widget_attrs(self.widget, attrs)
+
+        choice_renderer = self.composer.choice_renderer
+        if choice_renderer is not None and choice_renderer.supports(self.widget):
+            subwidgets = choice_renderer.subwidgets(
+                self.widget,
+                self.html_name,
+                self.value(),
+                attrs=attrs,
+                renderer=self.form.renderer
+            )
+            if subwidgets is not None:
+                return subwidgets
+
         return [
             BoundWidget(self.widget, widget, self.form.renderer)
             for widget in self.widget.subwidgets(
@@ -184,3 +412,35 @@ class BoundField(_BoundField):
                     not self.widget.supports_microseconds):
                 data = data.replace(microsecond=0)
             return data
+
+
+def get_bound_field(form, name: str) -> BoundField:
+    """
+    Returns the paper-forms bound field for the given form field.
+    Bound fields are cached on the form instance, so their cached properties
+    are computed once no matter how many times the field is accessed.
+    """
+    try:
+        cache = form._paper_bound_fields
+    except AttributeError:
+        cache = form._paper_bound_fields = {}
+
+    try:
+        return cache[name]
+    except KeyError:
+        pass
+
+    stopwatch = Stopwatch() if field_rendered.receivers else None
+    composer = get_render_session(form).composer
+    if stopwatch is not None:
+        stopwatch.lap("composer")
+
+    bound_field = cache[name] = BoundField(
+        form=form,
+        field=form.fields[name],
+        name=name,
+        composer=composer,
+    )
+    if stopwatch is not None:
+        bound_field._composer_time = stopwatch.timings["composer"]
+    return bound_field
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+__all__ = [
+    "BaseFragmentCache",
+    "LocMemFragmentCache",
+    "DjangoFragmentCache",
+    "make_fragment_key",
+]
+
+
+class BaseFragmentCache:
+    """
+    Storage for rendered HTML fragments of unbound form fields.
+    """
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class LocMemFragmentCache(BaseFragmentCache):
+    """
+    In-memory LRU cache, local to the process.
+    """
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class DjangoFragmentCache(BaseFragmentCache):
+    """
+    Stores fragments in one of the caches from the `CACHES` setting.
+
+    Fragment keys are versioned by a generation number stored in the same cache.
+    `clear()` starts a new generation instead of clearing the whole cache,
+    so the other data of the alias (e.g. sessions) is kept. The generation
+    is kept in the process for `generation_ttl` seconds, so `clear()` called
+    by other processes takes effect after this delay.
+    """
+    generation_key = "paper_forms.fragment.generation"
+    generation_ttl = 1.0
+
+    def __init__(self, alias: str = "default", timeout: Optional[int] = None):
+        self.alias = alias
+        self.timeout = timeout
+        self._generation: Optional[int] = None
+        self._generation_expires = 0.0
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def get_generation(self) -> int:
+        now = time.monotonic()
+        if self._generation is None or now >= self._generation_expires:
+            # Start from the current time, so that a generation number evicted
+            # from the cache is never reused.
+            self._generation = self.cache.get_or_set(self.generation_key, time.time_ns() // 1000, None)
+            self._generation_expires = now + self.generation_ttl
+        return self._generation
+
+    def get_version(self) -> str:
+        return "{}.{}".format(self.cache.version, self.get_generation())
+
+    def get(self, key: str) -> Optional[str]:
+        return self.cache.get(key, version=self.get_version())
+
+    def set(self, key: str, value: str):
+        self.cache.set(key, value, self.timeout, version=self.get_version())
+
+    def clear(self):
+        try:
+            self._generation = self.cache.incr(self.generation_key)
+        except ValueError:
+            # The generation is not set yet (or has been evicted).
+            self._generation = None
+
+
+def make_fragment_key(*parts: Any) -> str:
+    # Lazy strings, dates and other non-JSON values are converted to `str`.
+    data = json.dumps(parts, sort_keys=True, default=str)
+    digest = hashlib.md5(data.encode(), usedforsecurity=False).hexdigest()
+    return "paper_forms.fragment.{}".format(digest)
@@ -0,0 +1,424 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Union
+
+from django.core.exceptions import EmptyResultSet
+from django.db.models import QuerySet
+from django.forms.boundfield import BoundWidget
+from django.forms.models import ModelChoiceIterator
+from django.forms.renderers import BaseRenderer
+from django.forms.widgets import ChoiceWidget, Select, Widget
+from django.utils.translation import get_language
+
+try:
+    from django.utils.choices import BaseChoiceIterator, CallableChoiceIterator
+except ImportError:  # Django < 5.0
+    from django.forms.fields import CallableChoiceIterator
+    BaseChoiceIterator = object
+
+__all__ = [
+    "ChoicesSource",
+    "ChoiceRenderer",
+    "get_choices_key",
+    "is_same_choices",
+    "load_choices",
+]
+
+
+def freeze_choices(choices) -> tuple:
+    """
+    Returns the choices as nested tuples, which can be hashed and compared.
+    """
+    return tuple(
+        (value, tuple(map(tuple, label)) if isinstance(label, (list, tuple)) else label)
+        for value, label in choices
+    )
+
+
+class ChoicesSource(BaseChoiceIterator):
+    """
+    Choices evaluated once and shared read-only by all the widgets (and fields)
+    that use them. With `ttl`, the choices are evaluated again when they are
+    older than `ttl` seconds.
+
+    The source can be an iterable, a callable returning one, or a queryset.
+    Querysets and callables are re-evaluated on refresh.
+    """
+    def __init__(self, source: Union[Callable, Any], ttl: Optional[float] = None):
+        self.source = source
+        self.ttl = ttl
+        self.version = 0
+        self._choices: Optional[tuple] = None
+        self._expires: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def expired(self) -> bool:
+        if self._choices is None:
+            return True
+        return self._expires is not None and time.monotonic() >= self._expires
+
+    def get(self) -> tuple:
+        if self.expired:
+            with self._lock:
+                if self.expired:
+                    self.refresh()
+        return self._choices
+
+    def refresh(self):
+        source = self.source
+        if isinstance(source, QuerySet):
+            source = source.all()
+        elif callable(source):
+            source = source()
+
+        choices = freeze_choices(source)
+        self._expires = None if self.ttl is None else time.monotonic() + self.ttl
+        self._choices = choices
+        self.version += 1
+
+    def clear(self):
+        self._choices = None
+
+    def __call__(self) -> tuple:
+        # Django < 5.0 evaluates non-callable choices of a field when it is
+        # created, but wraps callables in `CallableChoiceIterator`.
+        return self.get()
+
+    def __iter__(self):
+        return iter(self.get())
+
+    def __len__(self):
+        return len(self.get())
+
+    def __getitem__(self, index):
+        return self.get()[index]
+
+    def __bool__(self):
+        return bool(self.get())
+
+    def __eq__(self, other):
+        if isinstance(other, ChoicesSource):
+            return self is other
+        if isinstance(other, (list, tuple)):
+            return list(self.get()) == list(other)
+        return NotImplemented
+
+    __hash__ = object.__hash__
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.source!r}, ttl={self.ttl!r})"
+
+
+def load_choices(widget: Widget):
+    """
+    Evaluates lazy choices (e.g. querysets of `ModelChoiceField`) of the widget
+    once, so that the following iterations don't hit the database again.
+    Shared choices are refreshed if needed, but stay shared.
+    """
+    choices = getattr(widget, "choices", None)
+    if isinstance(choices, ChoicesSource):
+        choices.get()
+    elif choices is not None and not isinstance(choices, (list, tuple)):
+        widget.choices = list(choices)
+
+
+def is_same_choices(field_choices: Any, source: ChoicesSource) -> bool:
+    """
+    Returns `True` if the choices of a form field come from the source
+    or are equal to it.
+    """
+    if field_choices is source:
+        return True
+    if isinstance(field_choices, CallableChoiceIterator):
+        # Django < 5.0 wraps the source, since it is callable.
+        return (getattr(field_choices, "func", None) or field_choices.choices_func) is source
+    if isinstance(field_choices, (list, tuple)):
+        return freeze_choices(field_choices) == source.get()
+    return False
+
+
+def get_choices_key(choices: Any) -> Optional[tuple]:
+    """
+    Returns a key that identifies lazy choices without evaluating them,
+    or `None` if they can't be identified. Forms with equal keys (e.g. the rows
+    of a formset) can share the evaluated choices.
+    """
+    if isinstance(choices, ModelChoiceIterator):
+        field = choices.field
+        queryset = choices.queryset
+        try:
+            query = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            query = None
+        return (
+            type(choices),
+            type(field),
+            field.empty_label,
+            field.to_field_name,
+            queryset.model,
+            queryset.db,
+            query,
+        )
+    if isinstance(choices, CallableChoiceIterator):
+        # Django < 5.0 calls the attribute `choices_func`.
+        return (type(choices), getattr(choices, "func", None) or choices.choices_func)
+    return None
+
+
+class ChoiceOptions:
+    """
+    The static part of the options of a choice widget: the option dicts
+    with nothing selected, built once and shared between renders.
+    """
+    __slots__ = ("optgroups", "positions", "locations", "selected_options", "html")
+
+    def __init__(self, optgroups: list):
+        self.optgroups = optgroups
+
+        # String value of the option -> positions of the options in the flat list
+        self.positions: dict[str, list[int]] = {}
+
+        # Flat position of the option -> (group position, position in group)
+        self.locations: list[tuple[int, int]] = []
+
+        self.selected_options: dict[int, dict] = {}
+        self.html: dict[tuple, str] = {}
+
+        for group_position, (_, options, _) in enumerate(optgroups):
+            for option_position, option in enumerate(options):
+                self.positions.setdefault(str(option["value"]), []).append(len(self.locations))
+                self.locations.append((group_position, option_position))
+
+    def find_selected(self, value: list[str], allow_multiple_selected: bool) -> list[int]:
+        positions = [
+            position
+            for option_value in set(value)
+            for position in self.positions.get(option_value, ())
+        ]
+        if allow_multiple_selected:
+            return sorted(positions)
+
+        # Only the first matching option is selected, as in `ChoiceWidget.optgroups()`.
+        return [min(positions)] if positions else []
+
+
+class ChoiceOptionsCache:
+    """
+    In-memory LRU cache of `ChoiceOptions`, local to the process.
+    """
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: OrderedDict[tuple, ChoiceOptions] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[ChoiceOptions]:
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+
+    def set(self, key: tuple, value: ChoiceOptions):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class CachedBoundWidget(BoundWidget):
+    """
+    `BoundWidget` whose HTML is rendered once per option state.
+    """
+    def __init__(self, parent_widget, data, renderer, options: ChoiceOptions, position: int):
+        super().__init__(parent_widget, data, renderer)
+        self.options = options
+        self.position = position
+
+    def tag(self, wrap_label=False):
+        key = (self.position, self.data["selected"], wrap_label, self.renderer)
+        try:
+            return self.options.html[key]
+        except KeyError:
+            html = self.options.html[key] = super().tag(wrap_label=wrap_label)
+            return html
+
+
+class ChoiceRenderer:
+    """
+    Builds the options of choice widgets (`Select`, `RadioSelect`,
+    `CheckboxSelectMultiple`, etc.) from a cached static part.
+    Per render, only the selected options are replaced.
+
+    Only the widgets that use the stock `optgroups()` and `create_option()`
+    implementations are supported.
+    """
+    def __init__(self, maxsize: int = 256):
+        self.cache = ChoiceOptionsCache(maxsize=maxsize)
+
+    def supports(self, widget: Widget) -> bool:
+        widget_class = type(widget)
+        return (
+            isinstance(widget, ChoiceWidget)
+            and widget_class.get_context in (ChoiceWidget.get_context, Select.get_context)
+            and widget_class.optgroups is ChoiceWidget.optgroups
+            and widget_class.create_option is ChoiceWidget.create_option
+        )
+
+    def get_cache_key(self, widget: ChoiceWidget, name: str, attrs: Optional[dict]) -> tuple:
+        if isinstance(widget.choices, ChoicesSource):
+            choices = (widget.choices, widget.choices.version)
+        else:
+            choices = freeze_choices(widget.choices)
+        return (
+            type(widget),
+            widget.input_type,
+            widget.option_template_name,
+            widget.option_inherits_attrs,
+            name,
+            tuple(widget.attrs.items()),
+            tuple(attrs.items()) if attrs else (),
+            choices,
+            get_language(),
+        )
+
+    def get_options(
+        self,
+        widget: ChoiceWidget,
+        name: str,
+        attrs: Optional[dict]
+    ) -> Optional[ChoiceOptions]:
+        """
+        Returns the static part of the options or `None` if the options
+        can't be cached (e.g. attributes are unhashable).
+        """
+        load_choices(widget)
+        key = self.get_cache_key(widget, name, attrs)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+
+        options = self.cache.get(key)
+        if options is None:
+            options = ChoiceOptions(widget.optgroups(name, [], attrs))
+            self.cache.set(key, options)
+        return options
+
+    def get_selected_option(
+        self,
+        widget: ChoiceWidget,
+        name: str,
+        attrs: Optional[dict],
+        options: ChoiceOptions,
+        position: int
+    ) -> dict:
+        try:
+            return options.selected_options[position]
+        except KeyError:
+            pass
+
+        group_position, option_position = options.locations[position]
+        group_name, group_options, _ = options.optgroups[group_position]
+        option = group_options[option_position]
+        selected_option = options.selected_options[position] = widget.create_option(
+            name,
+            option["value"],
+            option["label"],
+            True,
+            group_position,
+            subindex=option_position if group_name is not None else None,
+            attrs=attrs,
+        )
+        return selected_option
+
+    def optgroups(
+        self,
+        widget: ChoiceWidget,
+        name: str,
+        value: list[str],
+        attrs: Optional[dict]
+    ) -> Optional[tuple[list, ChoiceOptions]]:
+        """
+        Same as `widget.optgroups()`. Returns the option groups along with
+        the cached static part, or `None` if the options can't be cached.
+        """
+        options = self.get_options(widget, name, attrs)
+        if options is None:
+            return None
+
+        selected = options.find_selected(value, widget.allow_multiple_selected)
+        if not selected:
+            return options.optgroups, options
+
+        # Copy only the groups that contain selected options.
+        optgroups = list(options.optgroups)
+        for position in selected:
+            group_position, option_position = options.locations[position]
+            group_name, group_options, index = optgroups[group_position]
+            if group_options is options.optgroups[group_position][1]:
+                group_options = list(group_options)
+                optgroups[group_position] = (group_name, group_options, index)
+            group_options[option_position] = self.get_selected_option(
+                widget, name, attrs, options, position
+            )
+        return optgroups, options
+
+    def get_context(
+        self,
+        widget: ChoiceWidget,
+        name: str,
+        value: Any,
+        attrs: Optional[dict] = None
+    ) -> dict:
+        """
+        Same as `widget.get_context()`.
+        """
+        context = Widget.get_context(widget, name, value, attrs)
+        result = self.optgroups(widget, name, context["widget"]["value"], attrs)
+        if result is None:
+            return widget.get_context(name, value, attrs)
+
+        context["widget"]["optgroups"] = result[0]
+        if type(widget).get_context is Select.get_context and widget.allow_multiple_selected:
+            context["widget"]["attrs"]["multiple"] = True
+        return context
+
+    def subwidgets(
+        self,
+        widget: ChoiceWidget,
+        name: str,
+        value: Any,
+        attrs: Optional[dict],
+        renderer: BaseRenderer
+    ) -> Optional[list[BoundWidget]]:
+        """
+        Same as `BoundField.subwidgets`, but the HTML of every option
+        is rendered once and reused.
+        """
+        result = self.optgroups(widget, name, widget.format_value(value), attrs)
+        if result is None:
+            return None
+
+        optgroups, options = result
+        return [
+            CachedBoundWidget(widget, option, renderer, options, position)
+            for position, option in enumerate(
+                option
+                for _, group_options, _ in optgroups
+                for option in group_options
+            )
+        ]
@@ -1,14 +1,23 @@
-import copy
-from typing import Any, Optional, ClassVar
+import weakref
+from typing import Any, ClassVar, Optional, Union
 
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.forms import BaseForm
 from django.forms.renderers import BaseRenderer
 from django.forms.widgets import Widget
-from django.utils.module_loading import import_string
+from django.utils.autoreload import file_changed
+from django.utils.functional import cached_property
 
 from . import conf
+from .attrs import AttrsBuilder
+from .cache import BaseFragmentCache
+from .choices import ChoiceRenderer, ChoicesSource
+from .renderers import FlatTemplatesMixin, has_default_render
+from .utils import get_renderer
+from .widgets import get_widget_factory
 
-__all__ = ["BaseComposer"]
+__all__ = ["BaseComposer", "FieldSpec", "WidgetDispatcher", "clear_template_cache"]
 
 
 class SingletonMeta(type):
@@ -21,60 +30,254 @@ class SingletonMeta(type):
         return cls._instances[cls]
 
 
+class FieldSpec:
+    """
+    Immutable set of the composer overrides for a single field.
+    Subclasses can declare additional `__slots__`.
+    """
+    __slots__ = (
+        "widget_factory",
+        "choices",
+        "label",
+        "help_text",
+        "css_classes",
+        "template_name",
+    )
+
+    _fields: tuple[str, ...] = __slots__
+
+    widget_factory: Optional[Any]
+    choices: Optional[ChoicesSource]
+    label: Optional[str]
+    help_text: Optional[str]
+    css_classes: Optional[str]
+    template_name: Optional[str]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(
+            slot
+            for klass in reversed(cls.__mro__)
+            for slot in klass.__dict__.get("__slots__", ())
+        )
+
+    def __init__(self, **kwargs):
+        for field in self._fields:
+            object.__setattr__(self, field, kwargs.pop(field, None))
+
+        if kwargs:
+            raise TypeError("Unexpected field spec attributes: {}".format(", ".join(kwargs)))
+
+    def __setattr__(self, key, value):
+        raise AttributeError("{} is immutable".format(type(self).__name__))
+
+    def __repr__(self):
+        return "{}({})".format(
+            type(self).__name__,
+            ", ".join(
+                "{}={!r}".format(field, getattr(self, field))
+                for field in self._fields
+            )
+        )
+
+
+class WidgetDispatcher:
+    """
+    Maps widget classes to values with respect to the MRO.
+    The result of a lookup is cached per concrete widget class.
+    """
+    def __init__(self, mapping: Optional[dict[type, Any]]):
+        self.mapping = mapping or {}
+        self._cache: dict[type, Any] = {}
+
+    def get(self, widget_class: type) -> Any:
+        try:
+            return self._cache[widget_class]
+        except KeyError:
+            pass
+
+        value = None
+        for base in widget_class.__mro__:
+            if base in self.mapping:
+                value = self.mapping[base]
+                break
+
+        self._cache[widget_class] = value
+        return value
+
+
 class BaseComposer(metaclass=SingletonMeta):
     renderer = None
+    fragment_cache: ClassVar[BaseFragmentCache] = None
+    choice_renderer: ClassVar[ChoiceRenderer] = None
     error_css_class: ClassVar[str] = None
     required_css_class: ClassVar[str] = None
     widgets: ClassVar[dict[str, Any]] = None
+    choices: ClassVar[dict[str, Any]] = None
     labels: ClassVar[dict[str, str]] = None
     help_texts: ClassVar[dict[str, str]] = None
     css_classes: ClassVar[dict[str, str]] = None
     template_names: ClassVar[dict[str, str]] = None
+    widget_template_names: ClassVar[dict[type, str]] = None
+    widget_css_classes: ClassVar[dict[type, str]] = None
+    field_spec_class: ClassVar[type[FieldSpec]] = FieldSpec
+    cache_templates: ClassVar[bool] = True
+    attrs_builder: ClassVar[bool] = False
 
     def get_renderer(self, form: BaseForm) -> BaseRenderer:
         renderer = self.renderer or form.default_renderer or conf.DEFAULT_FORM_RENDERER
-        if isinstance(renderer, str):
-            renderer_class = import_string(renderer)
-            return renderer_class()
-        elif isinstance(renderer, type):
-            return renderer()
-        return renderer
+        return get_renderer(renderer)
+
+    @cached_property
+    def field_specs(self) -> dict[str, FieldSpec]:
+        return {}
+
+    def get_field_spec(self, name: str) -> FieldSpec:
+        """
+        Returns the compiled overrides for the given field.
+        Specs are built on first use and cached for the lifetime of the composer.
+        """
+        try:
+            return self.field_specs[name]
+        except KeyError:
+            spec = self.field_spec_class(**self.build_field_spec(name))
+            return self.field_specs.setdefault(name, spec)
+
+    def build_field_spec(self, name: str) -> dict[str, Any]:
+        """
+        Returns the attributes of the field spec. Subclasses can extend
+        the result to contribute their own attributes.
+        """
+        widget = self.widgets.get(name) if self.widgets else None
+        choices = self.choices.get(name) if self.choices else None
+        if choices is not None and not isinstance(choices, ChoicesSource):
+            choices = ChoicesSource(choices)
+        return {
+            "widget_factory": None if widget is None else get_widget_factory(widget),
+            "choices": choices,
+            "label": self.labels.get(name) if self.labels else None,
+            "help_text": self.help_texts.get(name) if self.help_texts else None,
+            "css_classes": self.css_classes.get(name) if self.css_classes else None,
+            "template_name": self.template_names.get(name) if self.template_names else None,
+        }
+
+    @cached_property
+    def template_name_dispatcher(self) -> WidgetDispatcher:
+        return WidgetDispatcher(self.widget_template_names)
+
+    @cached_property
+    def widget_css_classes_dispatcher(self) -> WidgetDispatcher:
+        return WidgetDispatcher({
+            widget_class: tuple(css_classes.split())
+            for widget_class, css_classes in (self.widget_css_classes or {}).items()
+        })
 
     def get_widget(self, name: str) -> Widget:
-        if self.widgets and name in self.widgets:
-            widget = self.widgets[name]
-            if isinstance(widget, type):
-                return widget()
-            else:
-                return copy.deepcopy(widget)
+        factory = self.get_field_spec(name).widget_factory
+        if factory is not None:
+            return factory()
+
+    def get_choices(self, name: str) -> Optional[ChoicesSource]:
+        return self.get_field_spec(name).choices
 
     def get_template_name(self, name: str, widget: Widget) -> str:
         # A hidden widgets should have a higher priority.
         if widget.is_hidden:
             return widget.template_name
 
-        if self.template_names and name in self.template_names:
-            return self.template_names[name]
+        template_name = self.get_field_spec(name).template_name
+        if template_name is not None:
+            return template_name
 
         return self.get_default_template_name(name, widget)
 
+    @cached_property
+    def css_classes_cache(self) -> "weakref.WeakKeyDictionary[type, dict]":
+        # Form class -> extra classes -> `BoundField.css_classes()` results
+        # for the (errors, required) combinations.
+        return weakref.WeakKeyDictionary()
+
+    @cached_property
+    def template_cache(self) -> dict[tuple, tuple[str, Any]]:
+        return {}
+
+    def get_template(self, name: str, widget: Widget, renderer: BaseRenderer) -> tuple[str, Any]:
+        """
+        Returns the template name and the resolved template object for the field.
+        The template is `None` if the renderer overrides `render()`, which must
+        then be used to render the field. The result is cached per field name,
+        widget class, widget template and hidden flag, unless `cache_templates`
+        is disabled.
+        """
+        key = (name, type(widget), widget.template_name, widget.is_hidden, renderer)
+        try:
+            return self.template_cache[key]
+        except KeyError:
+            pass
+
+        template_name = self.get_template_name(name, widget)
+        if not has_default_render(renderer):
+            result = (template_name, None)
+        else:
+            if isinstance(renderer, FlatTemplatesMixin):
+                lookup_name = renderer.get_field_template_name(template_name, widget.template_name)
+            else:
+                lookup_name = template_name
+            result = (template_name, renderer.get_template(lookup_name))
+
+        if self.cache_templates:
+            self.template_cache[key] = result
+        return result
+
     def get_default_template_name(self, name: str, widget: Widget) -> str:
-        return widget.template_name
+        return self.template_name_dispatcher.get(type(widget)) or widget.template_name
 
     def get_label(self, name: str, widget: Widget) -> Optional[str]:
-        if self.labels and name in self.labels:
-            return self.labels[name]
+        return self.get_field_spec(name).label
 
     def get_help_text(self, name: str, widget: Widget) -> Optional[str]:
-        if self.help_texts and name in self.help_texts:
-            return self.help_texts[name]
+        return self.get_field_spec(name).help_text
 
     def get_css_classes(self, name: str, widget: Widget) -> Optional[str]:
-        if self.css_classes and name in self.css_classes:
-            return self.css_classes[name]
+        return self.get_field_spec(name).css_classes
 
-    def build_widget_attrs(self, name: str, attrs: Optional[dict], widget: Widget) -> dict:
-        return attrs or {}
+    def build_widget_attrs(
+        self,
+        name: str,
+        attrs: Optional[Union[dict, AttrsBuilder]],
+        widget: Widget
+    ) -> Union[dict, AttrsBuilder]:
+        attrs = attrs or {}
+        css_classes = self.widget_css_classes_dispatcher.get(type(widget))
+        if css_classes:
+            # `AttrsBuilder` is an ABC, so checking for `dict` is faster.
+            if isinstance(attrs, dict):
+                value = attrs.get("class")
+                if value:
+                    value = " ".join(dict.fromkeys((*value.split(), *css_classes)))
+                else:
+                    value = " ".join(css_classes)
+                attrs = {**attrs, "class": value}
+            else:
+                attrs.add_class(*css_classes)
+        return attrs
 
     def build_context(self, name: str, context: Optional[dict], widget: Widget) -> dict:
         return context or {}
+
+
+def clear_template_cache():
+    for composer in SingletonMeta._instances.values():
+        composer.__dict__.pop("template_cache", None)
+
+
+@receiver(setting_changed)
+def _reset_templates_on_setting_change(setting, **kwargs):
+    if setting in {"TEMPLATES", "FORM_RENDERER", "PAPER_FORMS_DEFAULT_FORM_RENDERER"}:
+        clear_template_cache()
+
+
+@receiver(file_changed)
+def _reset_templates_on_file_change(sender, file_path, **kwargs):
+    if file_path.suffix != ".py":
+        clear_template_cache()
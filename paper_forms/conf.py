@@ -1,4 +1,15 @@
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 
 DEFAULT_COMPOSER = getattr(settings, "PAPER_FORMS_DEFAULT_COMPOSER", "paper_forms.composer.BaseComposer")
 DEFAULT_FORM_RENDERER = getattr(settings, "PAPER_FORMS_DEFAULT_FORM_RENDERER", None)
+
+
+@receiver(setting_changed)
+def _reload_settings(setting, **kwargs):
+    global DEFAULT_COMPOSER, DEFAULT_FORM_RENDERER
+    if setting == "PAPER_FORMS_DEFAULT_COMPOSER":
+        DEFAULT_COMPOSER = getattr(settings, "PAPER_FORMS_DEFAULT_COMPOSER", "paper_forms.composer.BaseComposer")
+    elif setting == "PAPER_FORMS_DEFAULT_FORM_RENDERER":
+        DEFAULT_FORM_RENDERER = getattr(settings, "PAPER_FORMS_DEFAULT_FORM_RENDERER", None)
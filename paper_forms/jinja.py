@@ -0,0 +1,136 @@
+"""
+Jinja2 integration. Imported only by the environments that use it:
+
+    "extensions": ["paper_forms.jinja.PaperFormExtension"]
+"""
+from jinja2 import nodes
+from jinja2.ext import Extension
+
+from .boundfield import get_bound_field
+from .rendering import arender_form, render_form
+from .utils import split_attr_name
+
+__all__ = ["PaperFormExtension"]
+
+
+class PaperFormExtension(Extension):
+    """
+    Provides the `{% field %}` and `{% fields %}` tags.
+
+    Tag arguments are split into widget attributes and context variables
+    when the template is compiled, so that a render is a direct call
+    to the bound field.
+    """
+    tags = {"field", "fields"}
+
+    def parse(self, parser):
+        token = next(parser.stream)
+        args, kwargs, target = self.parse_args(parser)
+        if token.value == "fields":
+            if kwargs:
+                parser.fail("'fields' tag takes no keyword arguments", token.lineno)
+            call = self.call_method(
+                "_arender_fields" if self.environment.is_async else "_render_fields",
+                args,
+                lineno=token.lineno
+            )
+        else:
+            if len(args) != 1:
+                parser.fail("'field' tag takes exactly one form field", token.lineno)
+            call = self.call_method(
+                "_arender_field" if self.environment.is_async else "_render_field",
+                [args[0], *self.split_kwargs(kwargs, token.lineno)],
+                lineno=token.lineno
+            )
+
+        if target is not None:
+            return nodes.Assign(nodes.Name(target, "store"), call, lineno=token.lineno)
+        return nodes.Output([call], lineno=token.lineno)
+
+    def parse_args(self, parser):
+        """
+        Parses `arg, ..., key=value, ... [as target]`.
+        """
+        args: list[nodes.Expr] = []
+        kwargs: list[tuple[str, nodes.Expr]] = []
+        target = None
+        while parser.stream.current.type != "block_end":
+            if parser.stream.current.test("name:as"):
+                next(parser.stream)
+                target = parser.stream.expect("name").value
+                break
+
+            if args or kwargs:
+                parser.stream.expect("comma")
+                if parser.stream.current.type == "block_end":
+                    break
+
+            current = parser.stream.current
+            if current.type == "name" and parser.stream.look().type == "assign":
+                key = next(parser.stream).value
+                next(parser.stream)
+                kwargs.append((key, parser.parse_expression()))
+            elif kwargs:
+                parser.fail("positional argument follows keyword argument",
+                            current.lineno)
+            else:
+                args.append(parser.parse_expression())
+        return args, kwargs, target
+
+    def split_kwargs(self, kwargs, lineno):
+        """
+        Returns the nodes of the widget attributes, the extra context
+        and the special context (`label`, `help_text` and `css_classes`).
+        The rules are the same as in `paper_forms.utils.split_attrs()`.
+        """
+        widget_attrs: list[nodes.Pair] = []
+        context: list[nodes.Pair] = []
+        special_context: list[nodes.Pair] = []
+        for key, value in kwargs:
+            is_context, name = split_attr_name(key)
+            pair = nodes.Pair(nodes.Const(name), value, lineno=lineno)
+            if not is_context:
+                widget_attrs.append(pair)
+            elif name == key:
+                special_context.append(pair)
+            else:
+                context.append(pair)
+
+        return [
+            nodes.Dict(items, lineno=lineno) if items else nodes.Const(None)
+            for items in (widget_attrs, context, special_context)
+        ]
+
+    @staticmethod
+    def _merge_context(context, special_context):
+        # Special cases are ignored if they are `None` at render time,
+        # as in `paper_forms.utils.split_attrs()`.
+        if special_context:
+            context = dict(context or ())
+            for name, value in special_context.items():
+                if value is not None:
+                    context[name] = value
+        return context
+
+    @staticmethod
+    def _render_field(form_field, attrs, context, special_context):
+        return get_bound_field(form_field.form, form_field.name).as_widget(
+            attrs=attrs,
+            extra_context=PaperFormExtension._merge_context(context, special_context)
+        )
+
+    @staticmethod
+    def _arender_field(form_field, attrs, context, special_context):
+        # Jinja2 awaits the returned coroutine.
+        return get_bound_field(form_field.form, form_field.name).aas_widget(
+            attrs=attrs,
+            extra_context=PaperFormExtension._merge_context(context, special_context)
+        )
+
+    @staticmethod
+    def _render_fields(form, *names):
+        return render_form(form, fields=names or None)
+
+    @staticmethod
+    def _arender_fields(form, *names):
+        return arender_form(form, fields=names or None)
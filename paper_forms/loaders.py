@@ -0,0 +1,92 @@
+import re
+
+from django.template import Origin, TemplateDoesNotExist
+from django.template.loaders.base import Loader as BaseLoader
+
+__all__ = ["Loader", "FLAT_TEMPLATE_SEPARATOR", "get_flat_template_name"]
+
+# Separates the field template name from the widget template name
+# in the name of a flattened template.
+FLAT_TEMPLATE_SEPARATOR = "::"
+
+STATIC_INCLUDE_RE = re.compile(r"""{%\s*include\s+(["'])(?P<name>[^"']+)\1\s*%}""")
+WIDGET_INCLUDE_RE = re.compile(r"{%\s*include\s+widget\.template_name\s*%}")
+EXTENDS_RE = re.compile(r"{%\s*(extends|block)\s")
+
+
+def get_flat_template_name(template_name: str, widget_template_name: str) -> str:
+    return "{}{}{}".format(template_name, FLAT_TEMPLATE_SEPARATOR, widget_template_name)
+
+
+class Loader(BaseLoader):
+    """
+    Wraps other loaders and inlines the static includes (`{% include "name" %}`
+    without `with` and `only` options) into the loaded templates, so that
+    the rendering of a field doesn't hit the loaders for every include.
+
+    The name of a flattened template can also carry the widget template name
+    (see `get_flat_template_name()`). In this case `{% include widget.template_name %}`
+    is inlined as well.
+    """
+    def __init__(self, engine, loaders):
+        self.loaders = engine.get_template_loaders(loaders)
+        super().__init__(engine)
+
+    def get_dirs(self):
+        for loader in self.loaders:
+            if hasattr(loader, "get_dirs"):
+                yield from loader.get_dirs()
+
+    def get_template_sources(self, template_name):
+        yield Origin(
+            name=template_name,
+            template_name=template_name,
+            loader=self,
+        )
+
+    def get_contents(self, origin):
+        template_name, _, widget_template_name = origin.template_name.partition(
+            FLAT_TEMPLATE_SEPARATOR
+        )
+
+        source = self.get_source(template_name)
+        if widget_template_name:
+            widget_source = self.get_source(widget_template_name)
+
+            # Templates with inheritance can't be inlined.
+            if not EXTENDS_RE.search(widget_source):
+                source = WIDGET_INCLUDE_RE.sub(lambda match: widget_source, source)
+
+        return self.inline_includes(source, {template_name})
+
+    def get_source(self, template_name: str) -> str:
+        for loader in self.loaders:
+            for origin in loader.get_template_sources(template_name):
+                try:
+                    return origin.loader.get_contents(origin)
+                except TemplateDoesNotExist:
+                    continue
+        raise TemplateDoesNotExist(template_name)
+
+    def inline_includes(self, source: str, stack: set) -> str:
+        def replace(match):
+            name = match.group("name")
+            if name in stack:
+                return match.group(0)
+
+            try:
+                included_source = self.get_source(name)
+            except TemplateDoesNotExist:
+                return match.group(0)
+
+            # Templates with inheritance can't be inlined.
+            if EXTENDS_RE.search(included_source):
+                return match.group(0)
+
+            return self.inline_includes(included_source, stack | {name})
+
+        return STATIC_INCLUDE_RE.sub(replace, source)
+
+    def reset(self):
+        for loader in self.loaders:
+            loader.reset()
@@ -0,0 +1,77 @@
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from django import forms
+from django.forms import renderers
+from django.utils.functional import cached_property
+
+from .loaders import get_flat_template_name
+
+__all__ = [
+    "FlatTemplatesMixin",
+    "FlatDjangoTemplates",
+    "FlatTemplatesSetting",
+    "has_default_render",
+]
+
+
+if TYPE_CHECKING:
+    from django.forms.renderers import BaseRenderer as _RendererBase
+else:
+    _RendererBase = object
+
+
+class FlatTemplatesMixin(_RendererBase):
+    """
+    Renders field templates flattened with the widget templates they include.
+    The engine must use `paper_forms.loaders.Loader`.
+    """
+    def get_field_template_name(self, template_name: str, widget_template_name: str) -> str:
+        if widget_template_name and widget_template_name != template_name:
+            return get_flat_template_name(template_name, widget_template_name)
+        return template_name
+
+    def render(self, template_name, context, request=None):
+        widget = context.get("widget")
+        if widget:
+            template_name = self.get_field_template_name(template_name, widget.get("template_name"))
+        return super().render(template_name, context, request=request)
+
+
+class FlatDjangoTemplates(FlatTemplatesMixin, renderers.DjangoTemplates):
+    """
+    Same as `django.forms.renderers.DjangoTemplates`, but with flattened templates.
+    """
+    @cached_property
+    def engine(self):
+        return self.backend({
+            "APP_DIRS": False,
+            "DIRS": [Path(forms.__file__).parent / self.backend.app_dirname],
+            "NAME": "djangoforms",
+            "OPTIONS": {
+                "loaders": [
+                    ("django.template.loaders.cached.Loader", [
+                        ("paper_forms.loaders.Loader", [
+                            "django.template.loaders.filesystem.Loader",
+                            "django.template.loaders.app_directories.Loader",
+                        ]),
+                    ]),
+                ],
+            },
+        })
+
+
+class FlatTemplatesSetting(FlatTemplatesMixin, renderers.TemplatesSetting):
+    """
+    Same as `django.forms.renderers.TemplatesSetting`, but with flattened templates.
+    `paper_forms.loaders.Loader` must be added to the loaders of the template engine.
+    """
+
+
+def has_default_render(renderer: renderers.BaseRenderer) -> bool:
+    """
+    Returns `True` if `renderer.render()` just renders the template returned
+    by `renderer.get_template()`, so that the template can be resolved once
+    and rendered directly. Renderers that override `render()` must be called.
+    """
+    return type(renderer).render in (renderers.BaseRenderer.render, FlatTemplatesMixin.render)
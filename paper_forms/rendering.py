@@ -0,0 +1,235 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Executor, Future
+from typing import Iterable, Iterator, Optional
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.forms import BaseForm
+from django.forms.formsets import BaseFormSet
+from django.forms.renderers import BaseRenderer
+from django.urls import get_script_prefix, get_urlconf, set_script_prefix, set_urlconf
+from django.utils import timezone, translation
+from django.utils.safestring import SafeString, mark_safe
+
+from .boundfield import get_bound_field
+from .choices import get_choices_key, load_choices
+from .session import get_render_session
+from .utils import split_attrs
+
+__all__ = ["render_form", "arender_form", "stream_form", "render_formset"]
+
+
+class _ThreadState:
+    """
+    Captures the thread-local state of the calling thread (active language,
+    timezone, urlconf and script prefix, as well as all context variables)
+    and restores it in a worker thread.
+    """
+    def __init__(self):
+        self.language = translation.get_language()
+        self.timezone = timezone.get_current_timezone()
+        self.urlconf = get_urlconf()
+        self.script_prefix = get_script_prefix()
+        self.context = contextvars.copy_context()
+        self.thread_id = threading.get_ident()
+
+    def run(self, func, *args, **kwargs):
+        return self.context.run(self._run, func, *args, **kwargs)
+
+    def _run(self, func, *args, **kwargs):
+        old_urlconf = get_urlconf()
+        old_script_prefix = get_script_prefix()
+        set_urlconf(self.urlconf)
+        set_script_prefix(self.script_prefix)
+        try:
+            with translation.override(self.language), timezone.override(self.timezone):
+                return func(*args, **kwargs)
+        finally:
+            set_urlconf(old_urlconf)
+            set_script_prefix(old_script_prefix)
+
+            # Database connections are thread-local and Django closes them only
+            # at the end of a request, in the request thread.
+            if threading.get_ident() != self.thread_id:
+                connections.close_all()
+
+
+def stream_form(
+    form: BaseForm,
+    fields: Optional[Iterable[str]] = None,
+    executor: Optional[Executor] = None,
+    **per_field_overrides: dict
+) -> Iterator[SafeString]:
+    """
+    Renders the given fields of the form (all of them by default) one by one,
+    yielding the HTML of each field as soon as it is rendered.
+    The composer and the renderer are resolved once for the whole form.
+
+    The result can be passed to `StreamingHttpResponse` or iterated
+    in a Jinja2 template rendered with `Template.generate()`.
+
+    If `executor` is given, the fields are rendered concurrently
+    by the executor and yielded in the original order.
+    """
+    renderer = get_render_session(form).renderer
+
+    if fields is None:
+        fields = form.fields
+
+    if executor is None:
+        for name in fields:
+            bound_field = get_bound_field(form, name)
+            widget_attrs, context = split_attrs(per_field_overrides.get(name) or {})
+            yield bound_field.as_widget(
+                attrs=widget_attrs,
+                extra_context=context,
+                renderer=renderer,
+            )
+        return
+
+    for future in _submit_fields(form, fields, executor, renderer, per_field_overrides):
+        yield future.result()
+
+
+def _submit_fields(
+    form: BaseForm,
+    fields: Iterable[str],
+    executor: Executor,
+    renderer: BaseRenderer,
+    per_field_overrides: dict[str, dict]
+) -> list[Future]:
+    # Validate the form, build bound fields with their widgets and load lazy
+    # choices in the calling thread, so that the queries run in its transaction
+    # and the workers only read the shared state. `arender_form()` validates
+    # the form and loads the choices beforehand, off the event loop.
+    form.errors
+    futures = []
+    for name in fields:
+        bound_field = get_bound_field(form, name)
+        load_choices(bound_field.widget)
+        widget_attrs, context = split_attrs(per_field_overrides.get(name) or {})
+        futures.append(
+            executor.submit(
+                _ThreadState().run,
+                bound_field.as_widget,
+                attrs=widget_attrs,
+                extra_context=context,
+                renderer=renderer,
+            )
+        )
+    return futures
+
+
+def render_form(
+    form: BaseForm,
+    fields: Optional[Iterable[str]] = None,
+    executor: Optional[Executor] = None,
+    **per_field_overrides: dict
+) -> SafeString:
+    """
+    Renders the given fields of the form (all of them by default) in one pass.
+    The composer and the renderer are resolved once for the whole form.
+
+    Keyword arguments map field names to the `{% field %}` tag parameters:
+
+        render_form(form, name={"placeholder": "Name", "_style": "dark"})
+
+    If `executor` is given, the fields are rendered concurrently by the executor.
+    """
+    return mark_safe("".join(stream_form(form, fields, executor, **per_field_overrides)))
+
+
+async def arender_form(
+    form: BaseForm,
+    fields: Optional[Iterable[str]] = None,
+    executor: Optional[Executor] = None,
+    **per_field_overrides: dict
+) -> SafeString:
+    """
+    Async version of `render_form()`. The form is validated and lazy choices
+    of all the fields are loaded in a worker thread before the form is rendered. With `executor`,
+    the rendered fields are awaited without blocking the event loop.
+    """
+    fields = list(form.fields if fields is None else fields)
+
+    if form.is_bound:
+        # Cleaning model fields queries the database.
+        await sync_to_async(lambda: form.errors)()
+
+    bound_fields = [get_bound_field(form, name) for name in fields]
+    await asyncio.gather(*(
+        bound_field.aprepare_widget(bound_field.widget)
+        for bound_field in bound_fields
+    ))
+
+    if executor is None:
+        return render_form(form, fields, None, **per_field_overrides)
+
+    renderer = get_render_session(form).renderer
+    futures = _submit_fields(form, fields, executor, renderer, per_field_overrides)
+    html = await asyncio.gather(*map(asyncio.wrap_future, futures))
+    return mark_safe("".join(html))
+
+
+def render_formset(
+    formset: BaseFormSet,
+    fields: Optional[Iterable[str]] = None,
+    **per_field_overrides: dict
+) -> SafeString:
+    """
+    Renders the given fields (all of them by default) of every form in the formset.
+
+    The overrides are parsed once per field, and lazy choices (e.g. querysets
+    of `ModelChoiceField`) are evaluated once and shared by the rows whose
+    choices come from the same source. Everything else, including the widget,
+    is taken from each form, so rows may have different fields and widgets.
+
+    The management form is not rendered.
+    """
+    overrides: dict[str, tuple[dict, dict]] = {}
+    shared_choices: dict[str, tuple[tuple, list]] = {}
+    output = []
+    for form in formset.forms:
+        for name in form.fields if fields is None else fields:
+            if name not in form.fields:
+                continue
+
+            try:
+                widget_attrs, context = overrides[name]
+            except KeyError:
+                widget_attrs, context = overrides[name] = split_attrs(
+                    per_field_overrides.get(name) or {}
+                )
+
+            bound_field = get_bound_field(form, name)
+            _share_choices(bound_field.widget, name, shared_choices)
+            output.append(
+                bound_field.as_widget(
+                    attrs=widget_attrs,
+                    extra_context=context,
+                )
+            )
+
+    return mark_safe("".join(output))
+
+
+def _share_choices(widget, name: str, shared_choices: dict[str, tuple[tuple, list]]):
+    choices = getattr(widget, "choices", None)
+    key = get_choices_key(choices)
+    if key is None:
+        load_choices(widget)
+        return
+
+    try:
+        shared_key, shared = shared_choices[name]
+    except KeyError:
+        pass
+    else:
+        if shared_key == key:
+            widget.choices = shared
+            return
+
+    load_choices(widget)
+    shared_choices[name] = (key, widget.choices)
@@ -0,0 +1,45 @@
+from typing import Optional
+
+from django.forms import BaseForm
+from django.forms.renderers import BaseRenderer, get_default_renderer
+
+from .composer import BaseComposer
+from .utils import get_composer
+
+__all__ = ["RenderSession", "get_render_session"]
+
+
+class RenderSession:
+    """
+    The values that don't change while a form is rendered: the composer,
+    the form renderer and the CSS classes table of the form class.
+    Resolved once per form instead of once per field.
+    """
+    __slots__ = ("composer", "renderer", "css_classes_cache")
+
+    def __init__(self, form: BaseForm, composer: BaseComposer):
+        self.composer = composer
+        self.renderer: BaseRenderer = composer.get_renderer(form) or get_default_renderer()
+
+        # `BoundField.css_classes()` results shared by the form class, or `None`
+        # if the form instance overrides `error_css_class`/`required_css_class`.
+        self.css_classes_cache: Optional[dict] = None
+        form_vars = vars(form)
+        if "error_css_class" not in form_vars and "required_css_class" not in form_vars:
+            try:
+                self.css_classes_cache = composer.css_classes_cache[type(form)]
+            except KeyError:
+                self.css_classes_cache = composer.css_classes_cache.setdefault(type(form), {})
+
+
+def get_render_session(form: BaseForm) -> RenderSession:
+    """
+    Returns the render session of the form. The session is cached
+    on the form instance, so it lives as long as the form (usually
+    a single request).
+    """
+    try:
+        return form._paper_render_session
+    except AttributeError:
+        session = form._paper_render_session = RenderSession(form, get_composer(form))
+        return session
@@ -0,0 +1,34 @@
+import time
+
+from django.dispatch import Signal
+
+__all__ = ["field_rendered"]
+
+# Sent by `BoundField.as_widget()` after a field has been rendered.
+#
+# Arguments:
+#   sender          The composer class.
+#   bound_field     The rendered `paper_forms.boundfield.BoundField`.
+#   template_name   The name of the field template.
+#   timings         A dict of durations (in seconds) of the rendering phases:
+#                   "composer" - composer resolution (reported only on the first
+#                                render of the bound field),
+#                   "widget"   - widget construction, attrs and template name,
+#                   "context"  - context building (skipped on cache hit),
+#                   "render"   - template rendering (skipped on cache hit).
+#   cache_hit       Whether the field was taken from the fragment cache
+#                   (`None` when the cache is disabled).
+#
+# Timings are measured only when the signal has receivers.
+field_rendered = Signal()
+
+
+class Stopwatch:
+    def __init__(self):
+        self.timings: dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def lap(self, phase: str):
+        now = time.perf_counter()
+        self.timings[phase] = now - self._last
+        self._last = now
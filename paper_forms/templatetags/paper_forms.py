@@ -1,73 +1,109 @@
-from django.template import library
+from django.template import Node, TemplateSyntaxError, library
+from django.template.base import token_kwargs
 
-from ..boundfield import BoundField
-from ..utils import get_composer
-
-try:
-    import jinja2
-except ImportError:
-    jinja2 = None
+from ..boundfield import get_bound_field
+from ..rendering import render_form
+from ..utils import split_attr_name
 
 register = library.Library()
 
 
-def _tag(form_field, **attrs):
-    form = form_field.form
-
-    bound_field = BoundField(
-        form=form_field.form,
-        field=form_field.field,
-        name=form_field.name,
-        composer=get_composer(form),
-    )
-
-    # Split `attrs` to widget attributes and context variables
-    context = {key[1:]: value for key, value in attrs.items() if key.startswith('_')}
-    widget_attrs = {key: value for key, value in attrs.items() if not key.startswith('_')}
-
-    # Special cases: `label` and `help_text` parameters are treated as context variables
-    label = widget_attrs.pop("label", None)
-    if label is not None:
-        context["label"] = label
-
-    help_text = widget_attrs.pop("help_text", None)
-    if help_text is not None:
-        context["help_text"] = help_text
-
-    css_classes = widget_attrs.pop("css_classes", None)
-    if css_classes is not None:
-        context["css_classes"] = css_classes
-
-    # Workaround for attributes with dashes
-    widget_attrs = {
-        key.replace("__", "-"): value
-        for key, value in widget_attrs.items()
-    }
-
-    return bound_field.as_widget(
-        attrs=widget_attrs,
-        extra_context=context
-    )
+class FieldNode(Node):
+    """
+    Renders a form field. Argument names are split into widget attributes
+    and context variables once, when the template is parsed.
+    """
+    def __init__(
+        self,
+        form_field,
+        widget_attrs,
+        extra_context,
+        special_context,
+        target_var=None
+    ):
+        self.form_field = form_field
+        self.widget_attrs = widget_attrs
+        self.extra_context = extra_context
+        self.special_context = special_context
+        self.target_var = target_var
+
+    def render(self, context):
+        form_field = self.form_field.resolve(context)
+        attrs = {
+            name: value.resolve(context)
+            for name, value in self.widget_attrs
+        }
+
+        extra_context = {
+            name: value.resolve(context)
+            for name, value in self.extra_context
+        }
+        for name, value in self.special_context:
+            # Special cases: `label`, `help_text` and `css_classes` are ignored
+            # if they are `None`, as in `paper_forms.utils.split_attrs()`.
+            value = value.resolve(context)
+            if value is not None:
+                extra_context[name] = value
+
+        bound_field = get_bound_field(form_field.form, form_field.name)
+        html = bound_field.as_widget(
+            attrs=attrs,
+            extra_context=extra_context
+        )
+
+        if self.target_var is not None:
+            context[self.target_var] = html
+            return ""
+        return html
+
+
+@register.tag
+def field(parser, token):
+    """
+    Usage: {% field form.name placeholder="Name" _style="dark" [as var] %}
+    """
+    bits = token.split_contents()
+    tag_name = bits.pop(0)
+
+    target_var = None
+    if len(bits) >= 2 and bits[-2] == "as":
+        target_var = bits[-1]
+        bits = bits[:-2]
+
+    if not bits:
+        raise TemplateSyntaxError(f"'{tag_name}' tag requires a form field")
+    form_field = parser.compile_filter(bits.pop(0))
+
+    kwargs = token_kwargs(bits, parser, support_legacy=False)
+    if bits:
+        raise TemplateSyntaxError(
+            f"'{tag_name}' tag received unexpected argument: {bits[0]!r}"
+        )
+
+    widget_attrs = []
+    extra_context = []
+    special_context = []
+    for key, value in kwargs.items():
+        is_context, name = split_attr_name(key)
+        if not is_context:
+            widget_attrs.append((name, value))
+        elif name == key:
+            special_context.append((name, value))
+        else:
+            extra_context.append((name, value))
+
+    return FieldNode(form_field, widget_attrs, extra_context, special_context, target_var)
 
 
 @register.simple_tag
-def field(form_field, **attrs):
-    return _tag(form_field, **attrs)
-
-
-if jinja2 is not None:
-    from jinja2_simple_tags import StandaloneTag
-
-    class PaperFormExtension(StandaloneTag):
-        tags = {"field"}
+def fields(form, *names):
+    return render_form(form, fields=names or None)
 
-        def render(self, form_field, **attrs):
-            return _tag(form_field, **attrs)
 
-    # django-jinja support
-    try:
-        from django_jinja import library
-    except ImportError:
-        pass
-    else:
-        library.extension(PaperFormExtension)
+def __getattr__(name):
+    # Backward compatibility: the Jinja2 extension has moved
+    # to `paper_forms.jinja` and is imported on demand.
+    if name == "PaperFormExtension":
+        from ..jinja import PaperFormExtension
+        return PaperFormExtension
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
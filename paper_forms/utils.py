@@ -1,10 +1,224 @@
+import weakref
+from typing import Any, Callable, Optional
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.forms.renderers import BaseRenderer
+from django.utils.autoreload import file_changed
 from django.utils.module_loading import import_string
 
 from . import conf
 
+# Process-wide registry of renderer instances, keyed by the renderer spec
+# (a dotted path or a class).
+_renderers: dict[Any, BaseRenderer] = {}
+
+# Composers resolved per form class. `None` means that the form class
+# has no `Composer` of its own and uses the default one.
+_composers: "weakref.WeakKeyDictionary[type, Any]" = weakref.WeakKeyDictionary()
+_default_composers: dict[str, Any] = {}
+
 
 def get_composer(form):
-    if hasattr(form, "Composer"):
-        return form.Composer()
-    else:
-        return import_string(conf.DEFAULT_COMPOSER)()
+    form_class = type(form)
+    try:
+        composer = _composers[form_class]
+    except KeyError:
+        composer_class = getattr(form_class, "Composer", None)
+        composer = _composers[form_class] = composer_class and composer_class()
+
+    if composer is None:
+        return get_default_composer()
+    return composer
+
+
+def get_default_composer():
+    try:
+        return _default_composers[conf.DEFAULT_COMPOSER]
+    except KeyError:
+        composer = import_string(conf.DEFAULT_COMPOSER)()
+        return _default_composers.setdefault(conf.DEFAULT_COMPOSER, composer)
+
+
+def clear_composer_cache():
+    _composers.clear()
+    _default_composers.clear()
+
+
+# Template tag arguments that are treated as context variables
+# even without the `_` prefix.
+CONTEXT_ARGUMENTS = frozenset({"label", "help_text", "css_classes"})
+
+
+def split_attr_name(key: str) -> tuple[bool, str]:
+    """
+    Classifies a template tag argument. Returns whether it is a context variable
+    and the name of the context variable or the widget attribute.
+    """
+    if key.startswith("_"):
+        return True, key[1:]
+    if key in CONTEXT_ARGUMENTS:
+        return True, key
+
+    # Workaround for attributes with dashes
+    return False, key.replace("__", "-")
+
+
+def split_attrs(attrs: dict) -> tuple[dict, dict]:
+    """
+    Splits the template tag arguments to widget attributes and context variables.
+    """
+    widget_attrs = {}
+    context = {}
+    special_context = {}
+    for key, value in attrs.items():
+        is_context, name = split_attr_name(key)
+        if not is_context:
+            widget_attrs[name] = value
+        elif name == key:
+            # Special cases: `label`, `help_text` and `css_classes` take
+            # precedence over the prefixed variables unless they are `None`.
+            if value is not None:
+                special_context[name] = value
+        else:
+            context[name] = value
+
+    context.update(special_context)
+    return widget_attrs, context
+
+
+class _Lazy:
+    __slots__ = ("factory",)
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+
+
+class LazyContext(dict):
+    """
+    Template context whose lazy values are computed on first access.
+
+    It is a real `dict`, so Django templates use it as is. Pending values
+    are stored as placeholders, so membership tests, which Django templates
+    run for every variable lookup, are not slowed down. Bulk operations
+    (iteration, comparison, copying) compute all pending values first.
+    """
+    __slots__ = ("_pending",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = False
+
+    def set_lazy(self, key: str, factory: Callable[[], Any]):
+        dict.__setitem__(self, key, _Lazy(factory))
+        self._pending = True
+
+    def resolve(self):
+        if self._pending:
+            for key, value in list(dict.items(self)):
+                if type(value) is _Lazy:
+                    dict.__setitem__(self, key, value.factory())
+            self._pending = False
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if type(value) is _Lazy:
+            value = value.factory()
+            dict.__setitem__(self, key, value)
+        return value
+
+    def __iter__(self):
+        self.resolve()
+        return dict.__iter__(self)
+
+    def __eq__(self, other):
+        self.resolve()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        self.resolve()
+        return dict.__ne__(self, other)
+
+    def __repr__(self):
+        self.resolve()
+        return dict.__repr__(self)
+
+    __hash__ = None
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key, *args):
+        value = dict.pop(self, key, *args)
+        if type(value) is _Lazy:
+            value = value.factory()
+        return value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            dict.__setitem__(self, key, default)
+        return self[key]
+
+    def keys(self):
+        self.resolve()
+        return dict.keys(self)
+
+    def values(self):
+        self.resolve()
+        return dict.values(self)
+
+    def items(self):
+        self.resolve()
+        return dict.items(self)
+
+    def copy(self):
+        self.resolve()
+        return dict(self)
+
+    def popitem(self):
+        self.resolve()
+        return dict.popitem(self)
+
+
+def get_renderer(renderer: Any) -> Optional[BaseRenderer]:
+    """
+    Returns a shared renderer instance for the given dotted path or class.
+    Renderer instances (and `None`) are returned as is.
+    """
+    if not isinstance(renderer, (str, type)):
+        return renderer
+
+    try:
+        return _renderers[renderer]
+    except KeyError:
+        pass
+
+    renderer_class = import_string(renderer) if isinstance(renderer, str) else renderer
+    return _renderers.setdefault(renderer, renderer_class())
+
+
+def clear_renderer_cache():
+    _renderers.clear()
+
+
+@receiver(setting_changed)
+def _reset_composers_on_setting_change(setting, **kwargs):
+    if setting == "PAPER_FORMS_DEFAULT_COMPOSER":
+        clear_composer_cache()
+
+
+@receiver(setting_changed)
+def _reset_renderers_on_setting_change(setting, **kwargs):
+    if setting in {"TEMPLATES", "FORM_RENDERER", "PAPER_FORMS_DEFAULT_FORM_RENDERER"}:
+        clear_renderer_cache()
+
+
+@receiver(file_changed)
+def _reset_renderers_on_file_change(sender, file_path, **kwargs):
+    # Renderers own their template engines, so any template change
+    # must drop them to get fresh loaders.
+    if file_path.suffix != ".py":
+        clear_renderer_cache()
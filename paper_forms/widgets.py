@@ -0,0 +1,64 @@
+import copy
+
+from django.forms.widgets import MultiWidget, Widget
+
+__all__ = [
+    "WidgetFactory",
+    "WidgetClassFactory",
+    "WidgetPrototype",
+    "IsolatedWidget",
+    "get_widget_factory",
+]
+
+
+class WidgetFactory:
+    """
+    Produces a fresh widget instance for every bound field.
+    """
+    def __call__(self) -> Widget:
+        raise NotImplementedError
+
+
+class WidgetClassFactory(WidgetFactory):
+    def __init__(self, widget_class: type[Widget]):
+        self.widget_class = widget_class
+
+    def __call__(self) -> Widget:
+        return self.widget_class()
+
+
+class WidgetPrototype(WidgetFactory):
+    """
+    Clones a preconfigured widget instance. Clones share everything with
+    the prototype (including the list of choices) except for `attrs`.
+    """
+    def __init__(self, widget: Widget):
+        self.prototype = copy.deepcopy(widget)
+
+    def __call__(self) -> Widget:
+        widget = copy.copy(self.prototype)
+        widget.attrs = self.prototype.attrs.copy()
+        return widget
+
+
+class IsolatedWidget(WidgetFactory):
+    """
+    Makes a deep copy of the widget for every bound field.
+    Use it for widgets that keep mutable state besides `attrs`.
+    """
+    def __init__(self, widget: Widget):
+        self.widget = widget
+
+    def __call__(self) -> Widget:
+        return copy.deepcopy(self.widget)
+
+
+def get_widget_factory(widget) -> WidgetFactory:
+    if isinstance(widget, WidgetFactory):
+        return widget
+    elif isinstance(widget, type):
+        return WidgetClassFactory(widget)
+    elif isinstance(widget, MultiWidget):
+        # Subwidgets are mutable too.
+        return IsolatedWidget(widget)
+    return WidgetPrototype(widget)
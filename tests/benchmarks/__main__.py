@@ -0,0 +1,98 @@
+"""
+Standalone benchmark runner:
+
+    cd tests && python -m benchmarks [--number N] [--filter SUBSTRING] [--no-imports]
+"""
+import argparse
+import gc
+import os
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+sys.path.insert(0, str(BASE_DIR.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings")
+
+
+def measure_allocations(func, number):
+    """
+    Calls `func` `number` times and returns the memory blocks allocated per call
+    that are still alive afterwards (i.e. growing caches or leaks), and the peak
+    of the memory allocated during the calls, above the memory in use before them.
+    """
+    exclude = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    tracemalloc.start()
+    try:
+        gc.collect()
+        before = tracemalloc.take_snapshot().filter_traces(exclude)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(number):
+            func()
+        _, peak = tracemalloc.get_traced_memory()
+        gc.collect()
+        after = tracemalloc.take_snapshot().filter_traces(exclude)
+    finally:
+        tracemalloc.stop()
+
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return blocks / number, peak - current
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="paper-forms rendering benchmarks")
+    parser.add_argument("--number", type=int, default=200, help="calls per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="number of measurements")
+    parser.add_argument("--filter", default="", help="run only cases containing this string")
+    parser.add_argument("--no-imports", action="store_true", help="skip import-time measurements")
+    args = parser.parse_args(argv)
+
+    import django
+    django.setup()
+
+    from .cases import get_cases
+
+    header = "{:<42} {:>12} {:>14} {:>16} {:>16}".format(
+        "case", "calls/sec", "fields/sec", "retained blocks", "allocated, KiB"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for case in get_cases():
+        if args.filter not in case.name:
+            continue
+
+        case.func()  # warm up template caches
+        best = min(timeit.repeat(case.func, number=args.number, repeat=args.repeat))
+        calls_per_sec = args.number / best
+        blocks, peak = measure_allocations(case.func, args.number)
+        print("{:<42} {:>12,.0f} {:>14,.0f} {:>16,.1f} {:>16,.1f}".format(
+            case.name,
+            calls_per_sec,
+            calls_per_sec * case.fields,
+            blocks,
+            peak / 1024
+        ))
+
+    if args.no_imports:
+        return
+
+    from .imports import get_import_results
+
+    header = "{:<42} {:>12} {:>14}".format("import", "ms", "new modules")
+    print()
+    print(header)
+    print("-" * len(header))
+    for result in get_import_results(repeat=args.repeat):
+        print("{:<42} {:>12,.1f} {:>14,}".format(
+            result.module,
+            result.seconds * 1000,
+            result.modules
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+pytest-benchmark entry point:
+
+    pytest tests/benchmarks/bench_rendering.py
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from .cases import get_cases  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def cases():
+    return {case.name: case for case in get_cases()}
+
+
+def pytest_generate_tests(metafunc):
+    if "case_name" in metafunc.fixturenames:
+        metafunc.parametrize("case_name", [case.name for case in get_cases()])
+
+
+def test_rendering(benchmark, cases, case_name):
+    case = cases[case_name]
+    benchmark.extra_info["fields"] = case.fields
+    benchmark(case.func)
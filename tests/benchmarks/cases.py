@@ -0,0 +1,148 @@
+"""
+Benchmark cases for field and form rendering.
+
+Every case is a callable that renders `fields` form fields per call.
+"""
+from typing import Callable, NamedTuple
+
+from app.forms import ExampleForm
+from django import forms
+from django.template import engines
+
+from paper_forms.boundfield import BoundField, get_bound_field
+from paper_forms.choices import ChoiceRenderer
+from paper_forms.composer import BaseComposer
+from paper_forms.utils import get_composer
+
+ENGINES = ["django", "jinja2"]
+
+DEFAULT_FORM_TEMPLATE = (
+    "{% for bound_field in form %}{{ bound_field }}{% endfor %}"
+)
+FIELD_TAG_FORM_TEMPLATES = {
+    "django": "{% for bound_field in form %}{% field bound_field %}{% endfor %}",
+    "jinja2": "{% for bound_field in form %}{% field bound_field %}{% endfor %}",
+}
+FIELDS_TAG_FORM_TEMPLATE = "{% fields form %}"
+
+COUNTRIES = [
+    ("c{}".format(index), "Country {}".format(index))
+    for index in range(250)
+]
+
+OPTIONS = [
+    ("o{}".format(index), "Option {}".format(index))
+    for index in range(1000)
+]
+
+
+class Case(NamedTuple):
+    name: str
+    func: Callable[[], object]
+    fields: int = 1
+
+
+class CountryForm(forms.Form):
+    country = forms.ChoiceField(choices=COUNTRIES)
+
+    class Composer(ExampleForm.Composer):
+        widgets = {
+            "country": forms.Select(choices=COUNTRIES),
+        }
+
+
+class LargeSelectForm(forms.Form):
+    option = forms.ChoiceField(choices=OPTIONS)
+
+    class Composer(BaseComposer):
+        pass
+
+
+class CachedLargeSelectForm(LargeSelectForm):
+    class Composer(BaseComposer):
+        choice_renderer = ChoiceRenderer()
+
+
+def _large_select_cases():
+    cases = []
+    for form_class, suffix in [(LargeSelectForm, ""), (CachedLargeSelectForm, ", ChoiceRenderer")]:
+        form = form_class(initial={"option": "o500"})
+        cases.append(Case(
+            f"as_widget (1,000 options{suffix})",
+            lambda form=form: BoundField(
+                form, form.fields["option"], "option", get_composer(form)
+            ).as_widget(),
+        ))
+        cases.append(Case(
+            f"subwidgets (1,000 options{suffix})",
+            lambda form=form: [
+                str(subwidget)
+                for subwidget in BoundField(
+                    form, form.fields["option"], "option", get_composer(form)
+                ).subwidgets
+            ],
+        ))
+    return cases
+
+
+def _as_widget_case():
+    bound_field = get_bound_field(ExampleForm(), "char")
+    return Case("BoundField.as_widget", bound_field.as_widget)
+
+
+def _field_node_case():
+    template = engines["django"].from_string(
+        '{% field form.char placeholder="Name" _style="dark" %}'
+    )
+    context = {"form": ExampleForm()}
+    return Case("FieldNode.render", lambda: template.render(context))
+
+
+def _get_widget_case():
+    composer = CountryForm.Composer()
+    return Case("BaseComposer.get_widget (250 choices)", lambda: composer.get_widget("country"))
+
+
+def _css_classes_case():
+    bound_field = get_bound_field(ExampleForm(), "char")
+    return Case("BoundField.css_classes", lambda: bound_field.css_classes("a b c a"))
+
+
+def _form_cases(engine_name: str):
+    engine = engines[engine_name]
+    field_count = len(ExampleForm.base_fields)
+
+    default_template = engine.from_string(DEFAULT_FORM_TEMPLATE)
+    field_tag_template = engine.from_string(FIELD_TAG_FORM_TEMPLATES[engine_name])
+    fields_tag_template = engine.from_string(FIELDS_TAG_FORM_TEMPLATE)
+
+    return [
+        Case(
+            "{}: {{{{ form.field }}}}".format(engine_name),
+            lambda: default_template.render({"form": ExampleForm()}),
+            field_count
+        ),
+        Case(
+            "{}: {{% field %}}".format(engine_name),
+            lambda: field_tag_template.render({"form": ExampleForm()}),
+            field_count
+        ),
+        Case(
+            "{}: {{% fields %}}".format(engine_name),
+            lambda: fields_tag_template.render({"form": ExampleForm()}),
+            field_count
+        ),
+    ]
+
+
+def get_cases() -> list[Case]:
+    cases = [
+        _as_widget_case(),
+        _field_node_case(),
+        _get_widget_case(),
+        _css_classes_case(),
+        *_large_select_cases(),
+    ]
+    for engine_name in ENGINES:
+        cases.extend(_form_cases(engine_name))
+    return cases
@@ -0,0 +1,69 @@
+"""
+Import-time measurements. Every module is imported in a fresh interpreter
+configured with the Django template engine only, which is what short-lived
+workers of Django-only deployments pay on a cold start.
+"""
+import subprocess
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+
+MODULES = [
+    "paper_forms.composer",
+    "paper_forms.boundfield",
+    "paper_forms.templatetags.paper_forms",
+    "paper_forms.jinja",
+]
+
+SCRIPT = """
+import sys
+import time
+from importlib import import_module
+
+import django
+from django.conf import settings
+
+settings.configure(
+    INSTALLED_APPS=["paper_forms"],
+    TEMPLATES=[{"BACKEND": "django.template.backends.django.DjangoTemplates"}],
+)
+django.setup()
+
+loaded = set(sys.modules)
+start = time.perf_counter()
+import_module(sys.argv[1])
+print(time.perf_counter() - start, len(set(sys.modules) - loaded))
+"""
+
+
+class ImportResult(NamedTuple):
+    module: str
+    seconds: float
+    modules: int
+
+
+def measure_import(module: str, repeat: int = 5) -> ImportResult:
+    """
+    Returns the best import time of the module and the number
+    of modules it loads on top of a configured Django.
+    """
+    results = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", SCRIPT, module],
+            cwd=ROOT_DIR,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        seconds, modules = output.split()
+        results.append((float(seconds), int(modules)))
+
+    seconds, modules = min(results)
+    return ImportResult(module, seconds, modules)
+
+
+def get_import_results(repeat: int = 5) -> list[ImportResult]:
+    return [measure_import(module, repeat=repeat) for module in MODULES]
@@ -64,7 +64,7 @@ TEMPLATES = [
         "APP_DIRS": True,
         "OPTIONS": {
             "extensions": [
-                "paper_forms.templatetags.paper_forms.PaperFormExtension"
+                "paper_forms.jinja.PaperFormExtension"
             ],
         },
     },
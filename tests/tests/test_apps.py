@@ -0,0 +1,47 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from django_jinja import library
+
+from paper_forms.jinja import PaperFormExtension
+from paper_forms.templatetags import paper_forms as paper_forms_tags
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+
+DJANGO_ONLY_SCRIPT = """
+import sys
+
+import django
+from django.conf import settings
+from django.template import engines
+
+settings.configure(
+    INSTALLED_APPS=["paper_forms"],
+    TEMPLATES=[{"BACKEND": "django.template.backends.django.DjangoTemplates"}],
+)
+django.setup()
+engines.all()
+
+import paper_forms.templatetags.paper_forms
+
+print(sorted(name for name in sys.modules if "jinja" in name))
+"""
+
+
+class TestJinjaIntegration:
+    def test_django_jinja_registration(self):
+        assert PaperFormExtension in library._local_env["extensions"]
+
+    def test_legacy_extension_path(self):
+        assert paper_forms_tags.PaperFormExtension is PaperFormExtension
+
+    def test_not_imported_without_jinja_engines(self):
+        output = subprocess.run(
+            [sys.executable, "-c", DJANGO_ONLY_SCRIPT],
+            cwd=ROOT_DIR,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        assert output.strip() == "[]"
@@ -0,0 +1,71 @@
+import pytest
+
+from paper_forms.attrs import AttrsBuilder
+
+
+class TestAttrsBuilder:
+    def test_layers(self):
+        widget_attrs = {"class": "form-control", "placeholder": "Name"}
+        attrs = AttrsBuilder(widget_attrs, {"placeholder": "Your Name", "required": True})
+        assert attrs.build() == {
+            "class": "form-control",
+            "placeholder": "Your Name",
+            "required": True,
+        }
+
+    def test_copy_on_write(self):
+        widget_attrs = {"class": "form-control", "placeholder": "Name"}
+        attrs = AttrsBuilder(widget_attrs)
+        attrs["placeholder"] = "Your Name"
+        attrs.add_class("is-invalid")
+        del attrs["class"]
+        attrs["maxlength"] = "64"
+        assert widget_attrs == {"class": "form-control", "placeholder": "Name"}
+
+    def test_delete(self):
+        attrs = AttrsBuilder({"placeholder": "Name"})
+        del attrs["placeholder"]
+        assert "placeholder" not in attrs
+        assert attrs.build() == {}
+
+        with pytest.raises(KeyError):
+            del attrs["placeholder"]
+
+        attrs["placeholder"] = "Your Name"
+        assert attrs.build() == {"placeholder": "Your Name"}
+
+    def test_add_class(self):
+        attrs = AttrsBuilder({"class": "large form-control"})
+        attrs.add_class("form-control", "is-valid")
+        assert attrs.has_class("is-valid")
+        assert attrs["class"] == "large form-control is-valid"
+
+    def test_remove_class(self):
+        attrs = AttrsBuilder({"class": "large form-control"}, {"id": "id_name"})
+        attrs.remove_class("large")
+        assert attrs.build() == {"class": "form-control", "id": "id_name"}
+
+        attrs.remove_class("form-control")
+        assert "class" not in attrs
+        assert attrs.build() == {"id": "id_name"}
+
+    def test_set_class(self):
+        attrs = AttrsBuilder({"class": "large"})
+        attrs.add_class("form-control")
+        attrs["class"] = "small"
+        attrs.add_class("form-control")
+        assert attrs["class"] == "small form-control"
+
+    def test_class_without_layers(self):
+        attrs = AttrsBuilder(None)
+        attrs.add_class("form-control")
+        assert attrs.build() == {"class": "form-control"}
+
+    def test_mapping(self):
+        attrs = AttrsBuilder({"id": "id_name"}, {"required": True})
+        assert attrs == {"id": "id_name", "required": True}
+        assert dict(attrs) == {"id": "id_name", "required": True}
+        assert len(attrs) == 2
+        assert attrs.get("missing") is None
+        assert attrs.pop("required") is True
+        assert list(attrs) == ["id"]
@@ -1,6 +1,9 @@
+import asyncio
+import threading
+
 from django import forms
 
-from paper_forms.boundfield import BoundField
+from paper_forms.boundfield import BoundField, get_bound_field
 from paper_forms.composer import BaseComposer
 
 
@@ -128,6 +131,83 @@ class TestBuildWidgetAttrs:
             "placeholder": "Your Name *",
         }
 
+    def test_dict_api(self):
+        class MyForm(forms.Form):
+            name = forms.CharField(
+                max_length=64,
+                widget=forms.TextInput(
+                    attrs={
+                        "class": "form-control",
+                    }
+                )
+            )
+
+        class Composer(BaseComposer):
+            def build_widget_attrs(self, name, attrs, widget):
+                attrs = super().build_widget_attrs(name, attrs, widget)
+                assert isinstance(attrs, dict)
+                attrs = attrs.copy()
+                attrs["data-x"] = "1"
+                return attrs | {"data-y": "2"}
+
+        bf = get_boundfield(MyForm(), "name", Composer())
+        attrs = bf.build_widget_attrs(bf.widget)
+        assert attrs == {
+            "class": "form-control",
+            "required": True,
+            "maxlength": "64",
+            "data-x": "1",
+            "data-y": "2",
+        }
+
+    def test_remove_class(self):
+        class MyForm(forms.Form):
+            name = forms.CharField(
+                max_length=64,
+                widget=forms.TextInput(
+                    attrs={
+                        "class": "form-control",
+                    }
+                )
+            )
+
+        class Composer(BaseComposer):
+            attrs_builder = True
+
+            def build_widget_attrs(self, name, attrs, widget):
+                attrs = super().build_widget_attrs(name, attrs, widget)
+                attrs.remove_class("form-control")
+                attrs.add_class("form-control-plaintext")
+                return attrs
+
+        form = MyForm()
+        bf = get_boundfield(form, "name", Composer())
+        attrs = bf.build_widget_attrs(bf.widget)
+        assert attrs == {
+            "class": "form-control-plaintext",
+            "required": True,
+            "maxlength": "64",
+        }
+        assert form.fields["name"].widget.attrs["class"] == "form-control"
+
+    def test_subwidgets(self):
+        class MyForm(forms.Form):
+            color = forms.ChoiceField(
+                choices=[("r", "Red"), ("g", "Green")],
+                widget=forms.RadioSelect,
+            )
+
+        class Composer(BaseComposer):
+            widget_css_classes = {
+                forms.RadioSelect: "form-check-input",
+            }
+
+        bf = get_boundfield(MyForm(), "color", Composer())
+        assert [
+            subwidget.data["attrs"]["class"]
+            for subwidget in bf.subwidgets
+        ] == ["form-check-input", "form-check-input"]
+
 
 class TestGetContext:
     def test_default(self):
@@ -288,6 +368,48 @@ class TestGetContext:
             "errors": [],
         }
 
+    def test_lazy_errors(self):
+        class MyForm(forms.Form):
+            name = forms.CharField(
+                max_length=64,
+            )
+
+        form = MyForm({"name": "John"})
+        bf = get_boundfield(form, "name", BaseComposer())
+        context = bf.get_context(
+            bf.widget,
+            name="name",
+            value="John",
+        )
+        assert form._errors is None
+
+        assert "errors" in context
+        assert form._errors is None
+
+        assert context["errors"] == []
+        assert form._errors == {}
+
+    def test_render_skips_unused_values(self):
+        class MyForm(forms.Form):
+            name = forms.CharField(
+                max_length=64,
+            )
+
+        calls = []
+
+        class Composer(BaseComposer):
+            template_names = {
+                "name": "django/forms/widgets/text.html",
+            }
+
+            def get_label(self, name, widget):
+                calls.append(name)
+                return super().get_label(name, widget)
+
+        bf = get_boundfield(MyForm(initial={"name": "John"}), "name", Composer())
+        assert 'value="John"' in bf.as_widget()
+        assert calls == []
+
 
 class TestCssClasses:
     def test_get_values_from_composer(self):
@@ -325,3 +447,129 @@ class TestCssClasses:
         bf = get_boundfield(form, "name", BaseComposer())
         css_classes = bf.css_classes()
         assert css_classes == "invalid required"
+
+    def test_extra_classes(self):
+        class MyForm(forms.Form):
+            name = forms.CharField(
+                max_length=64,
+            )
+
+        class Composer(BaseComposer):
+            error_css_class = "invalid"
+            required_css_class = "required"
+
+        bf = get_boundfield(MyForm(), "name", Composer())
+        assert bf.css_classes("large large") == "large required"
+        assert bf.css_classes(["large", "wide"]) == "large wide required"
+
+    def test_cached_per_form_class(self):
+        class MyForm(forms.Form):
+            name = forms.CharField(
+                max_length=64,
+            )
+
+        class Composer(BaseComposer):
+            error_css_class = "invalid"
+            required_css_class = "required"
+
+        composer = Composer()
+        assert get_boundfield(MyForm(), "name", composer).css_classes("large") == "large required"
+        assert composer.css_classes_cache[MyForm]["large"] == (
+            "large",
+            "large required",
+            "large invalid",
+            "large invalid required",
+        )
+        assert get_boundfield(MyForm({}), "name", composer).css_classes("large") == "large invalid required"
+
+    def test_instance_override(self):
+        class MyForm(forms.Form):
+            name = forms.CharField(
+                max_length=64,
+            )
+
+        composer = BaseComposer()
+        assert get_boundfield(MyForm(), "name", composer).css_classes() == ""
+
+        form = MyForm()
+        form.required_css_class = "required"
+        assert get_boundfield(form, "name", composer).css_classes() == "required"
+        assert get_boundfield(MyForm(), "name", composer).css_classes() == ""
+
+
+class TestGetBoundField:
+    def test_composer(self):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+            class Composer(BaseComposer):
+                pass
+
+        bf = get_bound_field(MyForm(), "name")
+        assert isinstance(bf, BoundField)
+        assert isinstance(bf.composer, MyForm.Composer)
+
+    def test_same_form(self):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+        form = MyForm()
+        bf = get_bound_field(form, "name")
+        assert get_bound_field(form, "name") is bf
+
+    def test_different_forms(self):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+        bf = get_bound_field(MyForm(), "name")
+        assert get_bound_field(MyForm(), "name") is not bf
+
+    def test_cached_widget(self):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+            class Composer(BaseComposer):
+                widgets = {
+                    "name": forms.Textarea,
+                }
+
+        form = MyForm()
+        widget = get_bound_field(form, "name").widget
+        assert get_bound_field(form, "name").widget is widget
+
+
+class TestAsyncAsWidget:
+    def test_render(self):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+        bf = get_bound_field(MyForm(), "name")
+        html = asyncio.run(bf.aas_widget(attrs={"placeholder": "Name"}))
+        assert html == bf.as_widget(attrs={"placeholder": "Name"})
+
+    def test_lazy_choices(self):
+        threads = []
+
+        def get_choices():
+            threads.append(threading.current_thread())
+            return [("r", "Red"), ("g", "Green")]
+
+        class MyForm(forms.Form):
+            color = forms.ChoiceField(choices=get_choices)
+
+        bf = get_bound_field(MyForm(), "color")
+        threads.clear()
+
+        html = asyncio.run(bf.aas_widget())
+        assert '<option value="g">Green</option>' in html
+        assert bf.widget.choices == [("r", "Red"), ("g", "Green")]
+        assert threads and threading.main_thread() not in threads
+
+    def test_static_choices(self):
+        class MyForm(forms.Form):
+            color = forms.ChoiceField(choices=[("r", "Red")])
+
+        bf = get_bound_field(MyForm(), "color")
+        choices = bf.widget.choices
+        asyncio.run(bf.aprepare_widget(bf.widget))
+        assert bf.widget.choices is choices
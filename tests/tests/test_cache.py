@@ -0,0 +1,170 @@
+from unittest import mock
+
+from django import forms
+from django.utils import translation
+
+from paper_forms.boundfield import get_bound_field
+from paper_forms.cache import DjangoFragmentCache, LocMemFragmentCache, make_fragment_key
+from paper_forms.composer import BaseComposer
+
+
+class CountingCache(LocMemFragmentCache):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.hits = 0
+
+    def get(self, key):
+        value = super().get(key)
+        if value is not None:
+            self.hits += 1
+        return value
+
+
+class TestLocMemFragmentCache:
+    def test_get_set(self):
+        cache = LocMemFragmentCache()
+        assert cache.get("key") is None
+        cache.set("key", "<input>")
+        assert cache.get("key") == "<input>"
+
+    def test_lru(self):
+        cache = LocMemFragmentCache(maxsize=2)
+        cache.set("a", "A")
+        cache.set("b", "B")
+        cache.get("a")
+        cache.set("c", "C")
+        assert cache.get("a") == "A"
+        assert cache.get("b") is None
+        assert cache.get("c") == "C"
+
+    def test_clear(self):
+        cache = LocMemFragmentCache()
+        cache.set("key", "<input>")
+        cache.clear()
+        assert cache.get("key") is None
+
+
+class TestDjangoFragmentCache:
+    def test_get_set(self):
+        cache = DjangoFragmentCache()
+        cache.clear()
+        assert cache.get("key") is None
+        cache.set("key", "<input>")
+        assert cache.get("key") == "<input>"
+
+    def test_clear(self):
+        cache = DjangoFragmentCache()
+        cache.set("key", "<input>")
+        cache.cache.set("other", "value")
+        cache.clear()
+        assert cache.get("key") is None
+        assert cache.cache.get("other") == "value"
+
+    def test_generation_round_trips(self):
+        cache = DjangoFragmentCache()
+        cache.clear()
+        cache.set("key", "<input>")
+        with mock.patch.object(cache.cache, "get_or_set") as get_or_set:
+            assert cache.get("key") == "<input>"
+            cache.set("key", "<select>")
+            assert cache.get("key") == "<select>"
+        get_or_set.assert_not_called()
+
+    def test_clear_by_other_process(self):
+        cache = DjangoFragmentCache()
+        other = DjangoFragmentCache()
+        cache.set("key", "<input>")
+        other.clear()
+        assert cache.get("key") == "<input>"
+        cache._generation_expires = 0
+        assert cache.get("key") is None
+
+
+class TestMakeFragmentKey:
+    def test_stable(self):
+        assert make_fragment_key("name", {"a": 1, "b": 2}) == make_fragment_key("name", {"b": 2, "a": 1})
+
+    def test_different(self):
+        assert make_fragment_key("name", {"a": 1}) != make_fragment_key("name", {"a": 2})
+
+
+class TestFragmentCache:
+    def _get_form_class(self):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+            class Composer(BaseComposer):
+                fragment_cache = CountingCache()
+
+        return MyForm
+
+    def test_unbound_form(self):
+        form_class = self._get_form_class()
+        html = get_bound_field(form_class(), "name").as_widget()
+        assert get_bound_field(form_class(), "name").as_widget() == html
+        assert form_class.Composer.fragment_cache.hits == 1
+
+    def test_different_attrs(self):
+        form_class = self._get_form_class()
+        get_bound_field(form_class(), "name").as_widget()
+        html = get_bound_field(form_class(), "name").as_widget(attrs={"placeholder": "Name"})
+        assert 'placeholder="Name"' in html
+        assert form_class.Composer.fragment_cache.hits == 0
+
+    def test_different_initial(self):
+        form_class = self._get_form_class()
+        get_bound_field(form_class(initial={"name": "John"}), "name").as_widget()
+        html = get_bound_field(form_class(initial={"name": "Jane"}), "name").as_widget()
+        assert 'value="Jane"' in html
+        assert form_class.Composer.fragment_cache.hits == 0
+
+    def test_different_language(self):
+        form_class = self._get_form_class()
+        with translation.override("en"):
+            get_bound_field(form_class(), "name").as_widget()
+        with translation.override("de"):
+            get_bound_field(form_class(), "name").as_widget()
+        assert form_class.Composer.fragment_cache.hits == 0
+
+    def test_instance_css_classes(self):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+            class Composer(BaseComposer):
+                fragment_cache = CountingCache()
+
+        bound_field = get_bound_field(MyForm(), "name")
+        bound_field.as_widget()
+        assert bound_field.css_classes() == ""
+
+        form = MyForm()
+        form.required_css_class = "req"
+        bound_field = get_bound_field(form, "name")
+        bound_field.as_widget()
+        assert bound_field.get_fragment_cache_key(bound_field.widget, "", "name", None, {}) is None
+        assert MyForm.Composer.fragment_cache.hits == 0
+
+    def test_bound_form(self):
+        form_class = self._get_form_class()
+        get_bound_field(form_class({"name": "John"}), "name").as_widget()
+        get_bound_field(form_class({"name": "John"}), "name").as_widget()
+        assert form_class.Composer.fragment_cache.hits == 0
+
+    def test_different_choices(self):
+        class MyForm(forms.Form):
+            letter = forms.ChoiceField()
+
+            class Composer(BaseComposer):
+                fragment_cache = CountingCache()
+
+            def __init__(self, *args, letters, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.fields["letter"].choices = [(letter, letter) for letter in letters]
+
+        get_bound_field(MyForm(letters="A"), "letter").as_widget()
+        html = get_bound_field(MyForm(letters="B"), "letter").as_widget()
+        assert '<option value="B">B</option>' in html
+        assert MyForm.Composer.fragment_cache.hits == 0
+
+        get_bound_field(MyForm(letters="B"), "letter").as_widget()
+        assert MyForm.Composer.fragment_cache.hits == 1
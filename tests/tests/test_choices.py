@@ -0,0 +1,285 @@
+import asyncio
+import copy
+
+import django
+import pytest
+from django import forms
+from django.core.exceptions import ImproperlyConfigured
+
+from paper_forms.boundfield import BoundField, get_bound_field
+from paper_forms.choices import ChoiceRenderer, ChoicesSource, get_choices_key
+from paper_forms.composer import BaseComposer
+
+from ._models import SampleModel
+
+COLORS = [
+    ("", "---"),
+    ("r", "Red"),
+    ("Dark", [
+        ("db", "Dark blue"),
+        ("dg", "Dark green"),
+    ]),
+    ("w", "White"),
+]
+
+
+class ColorForm(forms.Form):
+    select = forms.ChoiceField(choices=COLORS, required=False)
+    select_multiple = forms.MultipleChoiceField(choices=COLORS, required=False)
+    radio = forms.ChoiceField(choices=COLORS, widget=forms.RadioSelect, required=False)
+    checkbox = forms.MultipleChoiceField(
+        choices=COLORS,
+        widget=forms.CheckboxSelectMultiple,
+        required=False
+    )
+
+
+class Composer(BaseComposer):
+    choice_renderer = ChoiceRenderer()
+
+
+def render(form, name, composer):
+    bound_field = BoundField(form, form.fields[name], name, composer)
+    return bound_field.as_widget()
+
+
+@pytest.mark.parametrize("name", ["select", "select_multiple", "radio", "checkbox"])
+class TestChoiceRenderer:
+    @pytest.mark.parametrize("data", [
+        {},
+        {"select": "dg", "select_multiple": ["r", "dg"], "radio": "w", "checkbox": ["db", "w"]},
+    ])
+    def test_same_html(self, name, data):
+        initial = {"select": "r", "select_multiple": ["w"], "radio": "", "checkbox": ["r"]}
+        for form in [ColorForm(initial=initial), ColorForm(data)]:
+            assert render(form, name, Composer()) == render(form, name, BaseComposer())
+
+    def test_subwidgets(self, name):
+        form = ColorForm(initial={"select": "dg", "radio": "dg", "checkbox": ["r", "dg"]})
+        subwidgets = BoundField(form, form.fields[name], name, Composer()).subwidgets
+        expected = BoundField(form, form.fields[name], name, BaseComposer()).subwidgets
+        assert [str(widget) for widget in subwidgets] == [str(widget) for widget in expected]
+        assert [widget.data for widget in subwidgets] == [widget.data for widget in expected]
+
+
+class TestChoiceOptions:
+    def test_static_part_is_shared(self):
+        renderer = ChoiceRenderer()
+        widget = forms.Select(choices=COLORS)
+        optgroups, options = renderer.optgroups(widget, "color", [], {"id": "id_color"})
+        assert renderer.optgroups(widget, "color", [], {"id": "id_color"})[0] is optgroups
+        assert options.optgroups is optgroups
+
+    def test_copy_on_write(self):
+        renderer = ChoiceRenderer()
+        widget = forms.Select(choices=COLORS)
+        optgroups, options = renderer.optgroups(widget, "color", ["db"], {})
+        assert optgroups is not options.optgroups
+        assert optgroups[1] is options.optgroups[1]
+        assert optgroups[2][1][0]["selected"] is True
+        assert options.optgroups[2][1][0]["selected"] is False
+
+    def test_single_selection(self):
+        renderer = ChoiceRenderer()
+        widget = forms.Select(choices=[("a", "A"), ("b", "B"), ("a", "Another A")])
+        optgroups, _ = renderer.optgroups(widget, "letter", ["a", "b"], {})
+        assert [options[0]["selected"] for _, options, _ in optgroups] == [True, False, False]
+
+    def test_lazy_choices(self):
+        renderer = ChoiceRenderer()
+        widget = forms.Select(choices=iter([("a", "A"), ("b", "B")]))
+        optgroups, _ = renderer.optgroups(widget, "letter", ["b"], {})
+        assert [options[0]["selected"] for _, options, _ in optgroups] == [False, True]
+
+    def test_maxsize(self):
+        renderer = ChoiceRenderer(maxsize=1)
+        widget = forms.Select(choices=COLORS)
+        _, options = renderer.optgroups(widget, "color", [], {})
+        renderer.optgroups(widget, "other", [], {})
+        assert renderer.optgroups(widget, "color", [], {})[1] is not options
+
+    def test_unhashable_attrs(self):
+        renderer = ChoiceRenderer()
+        widget = forms.Select(choices=COLORS)
+        assert renderer.optgroups(widget, "color", [], {"data-ids": [1, 2]}) is None
+        context = renderer.get_context(widget, "color", "r", {"data-ids": [1, 2]})
+        assert context == widget.get_context("color", "r", {"data-ids": [1, 2]})
+
+    def test_unsupported_widget(self):
+        class CustomSelect(forms.Select):
+            def create_option(self, *args, **kwargs):
+                return super().create_option(*args, **kwargs)
+
+        renderer = ChoiceRenderer()
+        assert renderer.supports(forms.RadioSelect()) is True
+        assert renderer.supports(CustomSelect()) is False
+        assert renderer.supports(forms.TextInput()) is False
+
+
+class TestChoicesSource:
+    def test_evaluated_once(self):
+        calls = []
+
+        def get_choices():
+            calls.append(1)
+            return [("r", "Red"), ("Dark", [("db", "Dark blue")])]
+
+        source = ChoicesSource(get_choices)
+        assert calls == []
+        assert list(source) == [("r", "Red"), ("Dark", (("db", "Dark blue"),))]
+        assert len(source) == 2
+        assert source[0] == ("r", "Red")
+        assert calls == [1]
+
+    def test_ttl(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("paper_forms.choices.time.monotonic", lambda: now[0])
+
+        values = iter([[("a", "A")], [("b", "B")]])
+        source = ChoicesSource(lambda: next(values), ttl=60)
+        assert list(source) == [("a", "A")]
+
+        now[0] += 30
+        assert list(source) == [("a", "A")]
+        assert source.version == 1
+
+        now[0] += 30
+        assert list(source) == [("b", "B")]
+        assert source.version == 2
+
+    def test_clear(self):
+        values = iter([[("a", "A")], [("b", "B")]])
+        source = ChoicesSource(lambda: next(values))
+        assert list(source) == [("a", "A")]
+        source.clear()
+        assert list(source) == [("b", "B")]
+
+    def test_shared_by_copies(self):
+        source = ChoicesSource([("a", "A")])
+        field = forms.ChoiceField(choices=source)
+        if django.VERSION >= (5, 0):
+            assert copy.deepcopy(field).choices is source
+            assert copy.deepcopy(field.widget).choices is source
+        else:
+            assert copy.deepcopy(field).choices.choices_func is source
+
+    def test_lazy_field_choices(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("paper_forms.choices.time.monotonic", lambda: now[0])
+
+        values = iter([[("a", "A")], [("b", "B")]])
+        source = ChoicesSource(lambda: next(values), ttl=60)
+        field = forms.ChoiceField(choices=source)
+        assert source.version == 0
+
+        assert field.clean("a") == "a"
+        now[0] += 60
+        assert field.clean("b") == "b"
+
+
+class TestGetChoicesKey:
+    def test_callable(self):
+        def get_choices():
+            return COLORS
+
+        field = forms.ChoiceField(choices=get_choices)
+        key = get_choices_key(copy.deepcopy(field).widget.choices)
+        assert key is not None
+        assert get_choices_key(copy.deepcopy(field).widget.choices) == key
+        assert get_choices_key(forms.ChoiceField(choices=lambda: COLORS).widget.choices) != key
+
+    def test_queryset(self):
+        field = forms.ModelChoiceField(SampleModel.objects.filter(name="a"))
+        key = get_choices_key(copy.deepcopy(field).widget.choices)
+        assert key is not None
+        assert get_choices_key(copy.deepcopy(field).widget.choices) == key
+
+        other = forms.ModelChoiceField(SampleModel.objects.filter(name="b"))
+        assert get_choices_key(other.widget.choices) != key
+
+    def test_static(self):
+        assert get_choices_key(forms.Select(choices=COLORS).choices) is None
+
+
+BW_COLORS = ChoicesSource(lambda: [("b", "Black"), ("w", "White")])
+TONES = ChoicesSource([("l", "Light"), ("d", "Dark")])
+
+
+class TestComposerChoices:
+    class ColorForm(forms.Form):
+        color = forms.ChoiceField(
+            choices=BW_COLORS,
+            widget=forms.RadioSelect,
+        )
+        tone = forms.ChoiceField(choices=TONES)
+
+        class Composer(BaseComposer):
+            widgets = {
+                "tone": forms.Select(attrs={"class": "tone"}),
+            }
+            choices = {
+                "color": BW_COLORS,
+                "tone": TONES,
+            }
+
+    def test_shared_between_forms(self):
+        composer = self.ColorForm.Composer()
+        source = composer.get_choices("color")
+        assert source is BW_COLORS
+        assert get_bound_field(self.ColorForm(), "color").widget.choices is source
+        assert get_bound_field(self.ColorForm(), "color").widget.choices is source
+
+    def test_composer_widget(self):
+        bound_field = get_bound_field(self.ColorForm(), "tone")
+        assert bound_field.widget.choices is self.ColorForm.Composer.choices["tone"]
+        html = bound_field.as_widget()
+        assert '<option value="l">Light</option>' in html
+        assert "Red" not in html
+
+    def test_async(self):
+        form = self.ColorForm()
+        bound_field = get_bound_field(form, "color")
+        html = asyncio.run(bound_field.aas_widget())
+        assert bound_field.widget.choices is self.ColorForm.Composer().get_choices("color")
+        assert "White" in html
+
+    def test_validation(self):
+        form = self.ColorForm({"color": "w", "tone": "d"})
+        assert form.is_valid(), form.errors
+        assert 'value="w"' in get_bound_field(form, "color").as_widget()
+
+    def test_static_choices(self):
+        class LetterForm(forms.Form):
+            letter = forms.ChoiceField(choices=[("a", "A"), ("b", "B")])
+
+            class Composer(BaseComposer):
+                choices = {
+                    "letter": [("a", "A"), ("b", "B")],
+                }
+
+        assert 'value="b"' in get_bound_field(LetterForm(), "letter").as_widget()
+
+    @pytest.mark.parametrize("field", [
+        forms.ChoiceField(choices=[]),
+        forms.ChoiceField(choices=lambda: [("red", "Red")]),
+        forms.ModelChoiceField(SampleModel.objects.none()),
+    ])
+    def test_different_choices(self, field):
+        class RedForm(forms.Form):
+            color = field
+
+            class Composer(BaseComposer):
+                choices = {
+                    "color": [("red", "Red")],
+                }
+
+        with pytest.raises(ImproperlyConfigured):
+            get_bound_field(RedForm(), "color").widget
+
+    def test_choice_renderer(self):
+        class Composer(self.ColorForm.Composer):
+            choice_renderer = ChoiceRenderer()
+
+        form = self.ColorForm(initial={"tone": "d"})
+        composer = Composer()
+        assert render(form, "tone", composer) == render(form, "tone", self.ColorForm.Composer())
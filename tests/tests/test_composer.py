@@ -1,7 +1,15 @@
+from pathlib import Path
+
+import pytest
 from django import forms
-from django.forms.renderers import Jinja2, TemplatesSetting
+from django.forms.renderers import DjangoTemplates, Jinja2, TemplatesSetting
+from django.utils.autoreload import file_changed
 
-from paper_forms.composer import BaseComposer
+from paper_forms.attrs import AttrsBuilder
+from paper_forms.boundfield import get_bound_field
+from paper_forms.composer import BaseComposer, FieldSpec, WidgetDispatcher, clear_template_cache
+from paper_forms.loaders import get_flat_template_name
+from paper_forms.renderers import FlatDjangoTemplates
 
 
 class TestSingleton:
@@ -58,6 +66,116 @@ class TestGetRenderer:
         renderer = composer.get_renderer(forms.Form())
         assert renderer is None
 
+    def test_shared_instance(self):
+        class Composer(BaseComposer):
+            renderer = "django.forms.renderers.Jinja2"
+
+        class OtherComposer(BaseComposer):
+            renderer = "django.forms.renderers.Jinja2"
+
+        renderer1 = Composer().get_renderer(forms.Form())
+        renderer2 = OtherComposer().get_renderer(forms.Form())
+        assert renderer1 is renderer2
+
+
+class TestFieldSpec:
+    def test_defaults(self):
+        spec = FieldSpec()
+        assert spec.label is None
+        assert spec.widget_factory is None
+
+    def test_immutable(self):
+        spec = FieldSpec(label="Name")
+        with pytest.raises(AttributeError):
+            spec.label = "Your Name"
+
+    def test_unexpected_attribute(self):
+        with pytest.raises(TypeError):
+            FieldSpec(placeholder="Name")
+
+    def test_subclass(self):
+        class PlaceholderSpec(FieldSpec):
+            __slots__ = ("placeholder",)
+
+        spec = PlaceholderSpec(label="Name", placeholder="Your Name")
+        assert spec.label == "Name"
+        assert spec.placeholder == "Your Name"
+
+
+class TestGetFieldSpec:
+    def test_empty(self):
+        spec = BaseComposer().get_field_spec("name")
+        assert spec.widget_factory is None
+        assert spec.label is None
+        assert spec.help_text is None
+        assert spec.css_classes is None
+        assert spec.template_name is None
+
+    def test_override(self):
+        class Composer(BaseComposer):
+            widgets = {
+                "name": forms.Textarea,
+            }
+            labels = {
+                "name": "Your Name",
+            }
+            help_texts = {
+                "name": "Enter your first name",
+            }
+            css_classes = {
+                "name": "text--red",
+            }
+            template_names = {
+                "name": "path/to/widget.html",
+            }
+
+        spec = Composer().get_field_spec("name")
+        assert isinstance(spec.widget_factory(), forms.Textarea)
+        assert spec.label == "Your Name"
+        assert spec.help_text == "Enter your first name"
+        assert spec.css_classes == "text--red"
+        assert spec.template_name == "path/to/widget.html"
+
+    def test_cached(self):
+        composer = BaseComposer()
+        assert composer.get_field_spec("name") is composer.get_field_spec("name")
+
+    def test_inheritance(self):
+        class Composer(BaseComposer):
+            labels = {
+                "name": "Your Name",
+            }
+
+        class ChildComposer(Composer):
+            help_texts = {
+                "name": "Enter your first name",
+            }
+
+        assert Composer().get_field_spec("name").help_text is None
+
+        spec = ChildComposer().get_field_spec("name")
+        assert spec.label == "Your Name"
+        assert spec.help_text == "Enter your first name"
+
+    def test_contribute(self):
+        class PlaceholderSpec(FieldSpec):
+            __slots__ = ("placeholder",)
+
+        class Composer(BaseComposer):
+            field_spec_class = PlaceholderSpec
+            placeholders = {
+                "name": "Your Name",
+            }
+
+            def build_field_spec(self, name):
+                spec = super().build_field_spec(name)
+                spec["placeholder"] = self.placeholders.get(name)
+                return spec
+
+        composer = Composer()
+        assert composer.get_field_spec("name").placeholder == "Your Name"
+        assert composer.get_field_spec("age").placeholder is None
+
 
 class TestGetWidget:
     def test_empty(self):
@@ -133,6 +251,157 @@ class TestGetTemplateName:
         assert template_name == "django/forms/widgets/text.html"
 
 
+class CountingRenderer(DjangoTemplates):
+    def __init__(self):
+        self.lookups = []
+
+    def get_template(self, template_name):
+        self.lookups.append(template_name)
+        return super().get_template(template_name)
+
+
+class TestGetTemplate:
+    def test_template(self):
+        renderer = DjangoTemplates()
+        template_name, template = BaseComposer().get_template("name", forms.TextInput(), renderer)
+        assert template_name == "django/forms/widgets/text.html"
+        assert template.template.name == "django/forms/widgets/text.html"
+
+    def test_custom_render(self):
+        class WrappingRenderer(DjangoTemplates):
+            def render(self, template_name, context, request=None):
+                return "<div>{}</div>".format(super().render(template_name, context, request))
+
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+            class Composer(BaseComposer):
+                renderer = WrappingRenderer()
+
+        renderer = MyForm.Composer.renderer
+        template_name, template = MyForm.Composer().get_template("name", forms.TextInput(), renderer)
+        assert template_name == "django/forms/widgets/text.html"
+        assert template is None
+
+        html = get_bound_field(MyForm(), "name").as_widget()
+        assert html.startswith("<div><input ")
+        assert html.endswith("></div>")
+
+    def test_cached(self):
+        class Composer(BaseComposer):
+            pass
+
+        renderer = CountingRenderer()
+        composer = Composer()
+        result = composer.get_template("name", forms.TextInput(), renderer)
+        assert composer.get_template("name", forms.TextInput(), renderer) is result
+        assert renderer.lookups == ["django/forms/widgets/text.html"]
+
+    def test_hidden_flag(self):
+        class Composer(BaseComposer):
+            template_names = {
+                "name": "django/forms/widgets/textarea.html",
+            }
+
+        renderer = DjangoTemplates()
+        composer = Composer()
+        widget = forms.TextInput()
+        assert composer.get_template("name", widget, renderer)[0] == "django/forms/widgets/textarea.html"
+
+        widget.input_type = "hidden"
+        assert composer.get_template("name", widget, renderer)[0] == "django/forms/widgets/text.html"
+
+    def test_disabled(self):
+        class Composer(BaseComposer):
+            cache_templates = False
+
+        renderer = CountingRenderer()
+        composer = Composer()
+        composer.get_template("name", forms.TextInput(), renderer)
+        composer.get_template("name", forms.TextInput(), renderer)
+        assert len(renderer.lookups) == 2
+
+    def test_clear_cache(self):
+        class Composer(BaseComposer):
+            pass
+
+        renderer = CountingRenderer()
+        composer = Composer()
+        composer.get_template("name", forms.TextInput(), renderer)
+        clear_template_cache()
+        composer.get_template("name", forms.TextInput(), renderer)
+        assert len(renderer.lookups) == 2
+
+    def test_template_changed(self):
+        class Composer(BaseComposer):
+            pass
+
+        renderer = CountingRenderer()
+        composer = Composer()
+        composer.get_template("name", forms.TextInput(), renderer)
+        file_changed.send(sender=None, file_path=Path("templates/index.html"))
+        composer.get_template("name", forms.TextInput(), renderer)
+        assert len(renderer.lookups) == 2
+
+    def test_flat_renderer(self):
+        class Composer(BaseComposer):
+            template_names = {
+                "name": "fields/field.html",
+            }
+
+        renderer = FlatDjangoTemplates()
+        template_name, template = Composer().get_template("name", forms.TextInput(), renderer)
+        assert template_name == "fields/field.html"
+        assert template.template.name == get_flat_template_name(
+            "fields/field.html", "django/forms/widgets/text.html"
+        )
+
+
+class TestGetDefaultTemplateName:
+    def test_default(self):
+        composer = BaseComposer()
+        template_name = composer.get_default_template_name("name", widget=forms.NumberInput())
+        assert template_name == "django/forms/widgets/number.html"
+
+    def test_widget_template_names(self):
+        class Composer(BaseComposer):
+            widget_template_names = {
+                forms.CheckboxInput: "checkbox.html",
+                forms.widgets.Input: "input.html",
+            }
+
+        composer = Composer()
+        assert composer.get_default_template_name("name", forms.CheckboxInput()) == "checkbox.html"
+        assert composer.get_default_template_name("name", forms.NumberInput()) == "input.html"
+        assert composer.get_default_template_name("name", forms.Textarea()) == "django/forms/widgets/textarea.html"
+
+
+class TestWidgetDispatcher:
+    def test_exact_class(self):
+        dispatcher = WidgetDispatcher({
+            forms.Select: "select",
+        })
+        assert dispatcher.get(forms.Select) == "select"
+
+    def test_mro(self):
+        dispatcher = WidgetDispatcher({
+            forms.Select: "select",
+            forms.Widget: "widget",
+        })
+        assert dispatcher.get(forms.SelectMultiple) == "select"
+        assert dispatcher.get(forms.TextInput) == "widget"
+
+    def test_missing(self):
+        dispatcher = WidgetDispatcher({
+            forms.Select: "select",
+        })
+        assert dispatcher.get(forms.TextInput) is None
+
+    def test_empty(self):
+        dispatcher = WidgetDispatcher(None)
+        assert dispatcher.get(forms.TextInput) is None
+
+
 class TestGetLabel:
     def test_empty(self):
         composer = BaseComposer()
@@ -229,6 +498,41 @@ class TestBuildWidgetAttrs:
             "placeholder": "Name",
         }
 
+    def test_widget_css_classes(self):
+        class Composer(BaseComposer):
+            widget_css_classes = {
+                forms.Select: "custom-select",
+                forms.Widget: "form-control",
+            }
+
+        composer = Composer()
+        assert composer.build_widget_attrs("name", None, widget=forms.SelectMultiple()) == {
+            "class": "custom-select",
+        }
+        assert composer.build_widget_attrs("name", {
+            "class": "large form-control",
+        }, widget=forms.TextInput()) == {
+            "class": "large form-control",
+        }
+
+        attrs = {"class": "large"}
+        result = composer.build_widget_attrs("name", attrs, widget=forms.TextInput())
+        assert type(result) is dict
+        assert result == {"class": "large form-control"}
+        assert attrs == {"class": "large"}
+
+    def test_attrs_builder(self):
+        class Composer(BaseComposer):
+            widget_css_classes = {
+                forms.Widget: "form-control",
+            }
+
+        attrs = AttrsBuilder({"class": "large"})
+        assert Composer().build_widget_attrs("name", attrs, widget=forms.TextInput()) is attrs
+        assert attrs.build() == {
+            "class": "large form-control",
+        }
+
 
 class TestBuildContext:
     def test_empty(self):
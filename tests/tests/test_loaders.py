@@ -0,0 +1,117 @@
+import pytest
+from app.forms import ExampleForm
+from django import forms
+from django.forms.renderers import DjangoTemplates
+from django.template import Context, Engine, TemplateDoesNotExist
+
+from paper_forms.boundfield import get_bound_field
+from paper_forms.loaders import get_flat_template_name
+from paper_forms.rendering import render_form
+from paper_forms.renderers import FlatDjangoTemplates
+
+TEMPLATES = {
+    "field.html": (
+        '<div>{% include widget.template_name %}'
+        '{% include "errors.html" %}{% include "help.html" with text=help_text %}</div>'
+    ),
+    "errors.html": '{% for error in errors %}<span>{{ error }}</span>{% endfor %}{% include "nested.html" %}',
+    "nested.html": "[nested]",
+    "help.html": "<small>{{ text }}</small>",
+    "widget.html": '<input name="{{ widget.name }}">',
+    "base.html": "{% block content %}{% endblock %}",
+    "child.html": '{% extends "base.html" %}{% block content %}child{% endblock %}',
+    "extends.html": '{% include "child.html" %}',
+    "recursive.html": '{% include "recursive.html" %}',
+    "missing.html": '{% include "does_not_exist.html" %}',
+}
+
+
+@pytest.fixture
+def loader():
+    engine = Engine(loaders=[
+        ("paper_forms.loaders.Loader", [
+            ("django.template.loaders.locmem.Loader", TEMPLATES),
+        ]),
+    ])
+    return engine.template_loaders[0]
+
+
+class TestLoader:
+    def test_static_includes(self, loader):
+        source = loader.get_contents(next(loader.get_template_sources("field.html")))
+        assert source == (
+            '<div>{% include widget.template_name %}'
+            '{% for error in errors %}<span>{{ error }}</span>{% endfor %}[nested]'
+            '{% include "help.html" with text=help_text %}</div>'
+        )
+
+    def test_widget_include(self, loader):
+        name = get_flat_template_name("field.html", "widget.html")
+        source = loader.get_contents(next(loader.get_template_sources(name)))
+        assert source.startswith('<div><input name="{{ widget.name }}">{% for error')
+
+    def test_widget_extends(self, loader):
+        name = get_flat_template_name("field.html", "child.html")
+        source = loader.get_contents(next(loader.get_template_sources(name)))
+        assert source.startswith("<div>{% include widget.template_name %}")
+
+        template = loader.get_template(name)
+        assert template.render(Context({
+            "widget": {"template_name": "child.html"},
+        })) == "<div>child[nested]<small></small></div>"
+
+    def test_extends(self, loader):
+        source = loader.get_contents(next(loader.get_template_sources("extends.html")))
+        assert source == '{% include "child.html" %}'
+
+    def test_recursion(self, loader):
+        source = loader.get_contents(next(loader.get_template_sources("recursive.html")))
+        assert source == '{% include "recursive.html" %}'
+
+    def test_missing_include(self, loader):
+        source = loader.get_contents(next(loader.get_template_sources("missing.html")))
+        assert source == '{% include "does_not_exist.html" %}'
+
+    def test_missing_template(self, loader):
+        with pytest.raises(TemplateDoesNotExist):
+            loader.get_template("does_not_exist.html")
+
+    def test_render(self, loader):
+        name = get_flat_template_name("field.html", "widget.html")
+        template = loader.get_template(name)
+        assert template.render(Context({
+            "widget": {"name": "title"},
+            "errors": ["Invalid"],
+            "help_text": "Help",
+        })) == '<div><input name="title"><span>Invalid</span>[nested]<small>Help</small></div>'
+
+
+class TestFlatDjangoTemplates:
+    def _render(self, renderer_class, data=None):
+        class FlatForm(ExampleForm):
+            class Composer(ExampleForm.Composer):
+                renderer = renderer_class
+
+        return render_form(FlatForm(data))
+
+    def test_same_output(self):
+        assert self._render(FlatDjangoTemplates) == self._render(DjangoTemplates)
+
+    def test_same_output_with_errors(self):
+        data = {"add-errors": "1"}
+        assert self._render(FlatDjangoTemplates, data) == self._render(DjangoTemplates, data)
+
+    def test_flat_template_used(self):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+            class Composer(ExampleForm.Composer):
+                renderer = FlatDjangoTemplates
+
+        form = MyForm()
+        renderer = FlatDjangoTemplates()
+        get_bound_field(form, "name").as_widget(renderer=renderer)
+        template = renderer.get_template(
+            get_flat_template_name("bootstrap4/input.html", "django/forms/widgets/text.html")
+        )
+        assert "{% include" not in template.template.source
@@ -1,9 +1,25 @@
+import asyncio
+import threading
+import types
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from django import forms
+from django.http import StreamingHttpResponse
 from django.core.validators import MinValueValidator
+from django.db import connections
+from django.template import TemplateSyntaxError as DjangoTemplateSyntaxError
 from django.template import engines
+from django.template.backends.jinja2 import Jinja2
+from django.urls import get_script_prefix, set_script_prefix
+from django.utils import translation
+from jinja2 import TemplateSyntaxError
 
 from paper_forms.composer import BaseComposer
+from paper_forms.boundfield import get_bound_field
+from paper_forms.rendering import arender_form, render_form, render_formset, stream_form
+
+from ._models import SampleModel
 
 
 class BookForm(forms.Form):
@@ -86,6 +102,90 @@ class TestDjango:
             '</div>'
         )
 
+    def test_special_cases_none(self, engine_name):
+        engine = engines[engine_name]
+
+        template = engine.from_string(
+            "{% field form.pages label=lbl help_text=None css_classes=classes %}"
+        )
+        assert template.render({
+            "form": BookForm(),
+            "lbl": None,
+            "classes": None,
+        }) == render_form(BookForm(), fields=["pages"])
+
+    def test_fields(self, engine_name):
+        engine = engines[engine_name]
+
+        template = engine.from_string(
+            "{% fields form %}"
+        )
+        assert template.render({
+            "form": BookForm()
+        }) == render_form(BookForm())
+
+    def test_fields_subset(self, engine_name):
+        engine = engines[engine_name]
+
+        template = engine.from_string(
+            "{% fields form \"title\" \"pages\" %}"
+        )
+        assert template.render({
+            "form": BookForm()
+        }) == render_form(BookForm(), fields=["title", "pages"])
+
+    def test_variables(self, engine_name):
+        engine = engines[engine_name]
+
+        template = engine.from_string(
+            "{% field form.author placeholder=name|upper label=label _style=style %}"
+        )
+        assert template.render({
+            "form": BookForm(),
+            "name": "Author",
+            "label": None,
+            "style": "dark",
+        }) == (
+            '<div class="field--dark">\n'
+            '  <label for="id_author">Author</label>\n'
+            '  <input type="text" name="author" maxlength="50" placeholder="AUTHOR" '
+            'required id="id_author">\n\n\n'
+            '</div>'
+        )
+
+    def test_assign(self, engine_name):
+        engine = engines[engine_name]
+
+        template = engine.from_string(
+            "{% field form.title placeholder=\"Book Title\" as title %}[{{ title }}]"
+        )
+        assert template.render({
+            "form": BookForm()
+        }) == (
+            '[<input type="text" name="title" maxlength="100" placeholder="Book Title" '
+            'required id="id_title">]'
+        )
+
+    def test_parsed_arguments(self, engine_name):
+        engine = engines[engine_name]
+
+        template = engine.from_string(
+            "{% field form.author data__id=pk _style=\"dark\" label=title %}"
+        )
+        node = template.template.nodelist[0]
+        assert [name for name, _ in node.widget_attrs] == ["data-id"]
+        assert [name for name, _ in node.extra_context] == ["style"]
+        assert [name for name, _ in node.special_context] == ["label"]
+
+    def test_invalid_arguments(self, engine_name):
+        engine = engines[engine_name]
+
+        with pytest.raises(DjangoTemplateSyntaxError):
+            engine.from_string("{% field %}")
+
+        with pytest.raises(DjangoTemplateSyntaxError):
+            engine.from_string("{% field form.title form.author %}")
+
 
 @pytest.mark.parametrize("engine_name", ["jinja2", "django-jinja"])
 class TestJinja2:
@@ -145,3 +245,433 @@ class TestJinja2:
             '  <small>Enter page count</small>\n'
             '</div>'
         )
+
+    def test_special_cases_none(self, engine_name):
+        engine = engines[engine_name]
+
+        template = engine.from_string(
+            "{% field form.pages, label=lbl, help_text=None, css_classes=classes %}"
+        )
+        assert template.render({
+            "form": BookForm(),
+            "lbl": None,
+            "classes": None,
+        }) == render_form(BookForm(), fields=["pages"])
+
+    def test_fields(self, engine_name):
+        engine = engines[engine_name]
+
+        template = engine.from_string(
+            "{% fields form %}"
+        )
+        assert template.render({
+            "form": BookForm()
+        }) == render_form(BookForm())
+
+    def test_fields_subset(self, engine_name):
+        engine = engines[engine_name]
+
+        template = engine.from_string(
+            "{% fields form, \"title\", \"pages\" %}"
+        )
+        assert template.render({
+            "form": BookForm()
+        }) == render_form(BookForm(), fields=["title", "pages"])
+
+    def test_assign(self, engine_name):
+        engine = engines[engine_name]
+
+        template = engine.from_string(
+            "{% field form.title, placeholder=\"Book Title\" as title %}[{{ title }}]"
+        )
+        assert template.render({
+            "form": BookForm()
+        }) == (
+            '[<input type="text" name="title" maxlength="100" placeholder="Book Title" '
+            'required id="id_title">]'
+        )
+
+    def test_compiled_arguments(self, engine_name):
+        engine = engines[engine_name]
+
+        source = engine.env.compile(
+            "{% field form.author, data__id=pk, _style=\"dark\", label=title %}",
+            raw=True
+        )
+        assert "'data-id'" in source
+        assert "'style'" in source
+        assert "split_attrs" not in source
+
+    def test_invalid_arguments(self, engine_name):
+        engine = engines[engine_name]
+
+        with pytest.raises(TemplateSyntaxError):
+            engine.from_string("{% field form.title, form.author %}")
+
+        with pytest.raises(TemplateSyntaxError):
+            engine.from_string("{% field form.title, placeholder=\"Title\", form.author %}")
+
+        with pytest.raises(TemplateSyntaxError):
+            engine.from_string("{% fields form, placeholder=\"Title\" %}")
+
+
+class TestRenderForm:
+    def test_all_fields(self):
+        form = BookForm()
+        assert render_form(form) == (
+            '<input type="text" name="title" maxlength="100" required id="id_title">'
+            + '<div class="">\n'
+            '  <label for="id_author">Author</label>\n'
+            '  <input type="text" name="author" maxlength="50" required id="id_author">\n\n\n'
+            '</div>'
+            + '<div class="">\n'
+            '  <label for="id_pages">Number of Pages</label>\n'
+            '  <input type="number" name="pages" required id="id_pages">\n\n\n'
+            '</div>'
+        )
+
+    def test_fields(self):
+        assert render_form(BookForm(), fields=["title"]) == (
+            '<input type="text" name="title" maxlength="100" required id="id_title">'
+        )
+
+    def test_per_field_overrides(self):
+        output = render_form(
+            BookForm(),
+            fields=["title", "author"],
+            title={"placeholder": "Book Title", "data__id": "42"},
+            author={"label": "Writer", "_style": "dark"},
+        )
+        assert output == (
+            '<input type="text" name="title" maxlength="100" placeholder="Book Title" '
+            'data-id="42" required id="id_title">'
+            '<div class="field--dark">\n'
+            '  <label for="id_author">Writer</label>\n'
+            '  <input type="text" name="author" maxlength="50" required id="id_author">\n\n\n'
+            '</div>'
+        )
+
+
+class TestStreamForm:
+    def test_generator(self):
+        stream = stream_form(BookForm())
+        assert isinstance(stream, types.GeneratorType)
+
+    def test_fragments(self):
+        fragments = list(stream_form(BookForm(), fields=["title", "pages"]))
+        assert fragments == [
+            '<input type="text" name="title" maxlength="100" required id="id_title">',
+            '<div class="">\n'
+            '  <label for="id_pages">Number of Pages</label>\n'
+            '  <input type="number" name="pages" required id="id_pages">\n\n\n'
+            '</div>',
+        ]
+
+    def test_same_as_render_form(self):
+        form = BookForm()
+        assert "".join(stream_form(form)) == render_form(form)
+
+    def test_streaming_response(self):
+        response = StreamingHttpResponse(stream_form(BookForm(), fields=["title"]))
+        assert b"".join(response.streaming_content) == (
+            b'<input type="text" name="title" maxlength="100" required id="id_title">'
+        )
+
+    def test_jinja2_generate(self):
+        template = engines["jinja2"].env.from_string(
+            "<form>{% for fragment in fields %}{{ fragment }}{% endfor %}</form>"
+        )
+        chunks = list(template.generate(fields=stream_form(BookForm(), fields=["title"])))
+        assert "".join(chunks) == (
+            '<form><input type="text" name="title" maxlength="100" required id="id_title"></form>'
+        )
+
+
+class TestAsyncRenderForm:
+    def test_render(self):
+        form = BookForm()
+        assert asyncio.run(arender_form(form)) == render_form(form)
+
+    def test_fields(self):
+        form = BookForm()
+        html = asyncio.run(arender_form(form, fields=iter(["title", "pages"]), title={"placeholder": "Title"}))
+        assert html == render_form(form, fields=["title", "pages"], title={"placeholder": "Title"})
+
+
+    @pytest.fixture
+    def sample_table(self):
+        # The test app has no models module, so the table is not migrated.
+        with connections["default"].schema_editor() as editor:
+            editor.create_model(SampleModel)
+        yield
+        with connections["default"].schema_editor() as editor:
+            editor.delete_model(SampleModel)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_bound_model_choice_field(self, sample_table):
+        sample = SampleModel.objects.create(name="a", password="", website="https://example.com")
+
+        class SampleForm(forms.Form):
+            sample = forms.ModelChoiceField(SampleModel.objects.all())
+
+        html = asyncio.run(arender_form(SampleForm({"sample": sample.pk})))
+        assert '<option value="{}" selected>'.format(sample.pk) in html
+
+        bound_field = get_bound_field(SampleForm({"sample": "0"}), "sample")
+        html = asyncio.run(bound_field.aas_widget())
+        assert '<option value="{}">'.format(sample.pk) in html
+        assert not bound_field.form.is_valid()
+
+
+class TestJinja2AsyncMode:
+    @pytest.fixture
+    def engine(self):
+        return Jinja2({
+            "NAME": "jinja2-async",
+            "DIRS": [],
+            "APP_DIRS": True,
+            "OPTIONS": {
+                "enable_async": True,
+                "extensions": [
+                    "paper_forms.jinja.PaperFormExtension"
+                ],
+            },
+        })
+
+    def test_field(self, engine):
+        template = engine.env.from_string(
+            "{% field form.title, placeholder=\"Book Title\" %}"
+        )
+        assert asyncio.run(template.render_async(form=BookForm())) == (
+            '<input type="text" name="title" maxlength="100" placeholder="Book Title" '
+            'required id="id_title">'
+        )
+
+    def test_fields(self, engine):
+        template = engine.env.from_string(
+            "{% fields form %}"
+        )
+        assert asyncio.run(template.render_async(form=BookForm())) == render_form(BookForm())
+
+
+class TestParallelRendering:
+    def test_field_order(self):
+        form = BookForm()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            html = render_form(form, executor=executor, title={"placeholder": "Title"})
+        assert html == render_form(form, title={"placeholder": "Title"})
+
+    def test_stream(self):
+        form = BookForm()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            fragments = list(stream_form(form, fields=["pages", "title"], executor=executor))
+        assert fragments == list(stream_form(form, fields=["pages", "title"]))
+
+    def test_thread_state(self):
+        states = []
+
+        class StateForm(forms.Form):
+            name = forms.CharField()
+
+            class Composer(BaseComposer):
+                def build_context(self, name, context, widget):
+                    states.append((
+                        threading.current_thread(),
+                        translation.get_language(),
+                        get_script_prefix(),
+                    ))
+                    return super().build_context(name, context, widget)
+
+        old_script_prefix = get_script_prefix()
+        set_script_prefix("/prefix/")
+        try:
+            with translation.override("de"), ThreadPoolExecutor(max_workers=1) as executor:
+                render_form(StateForm(), executor=executor)
+        finally:
+            set_script_prefix(old_script_prefix)
+
+        thread, language, script_prefix = states[0]
+        assert thread is not threading.current_thread()
+        assert language == "de"
+        assert script_prefix == "/prefix/"
+
+    def test_async(self):
+        form = BookForm()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            html = asyncio.run(arender_form(form, executor=executor))
+        assert html == render_form(form)
+
+    def test_async_event_loop(self):
+        rendering = threading.Event()
+        released = threading.Event()
+
+        class SlowForm(forms.Form):
+            name = forms.CharField()
+
+            class Composer(BaseComposer):
+                def build_context(self, name, context, widget):
+                    rendering.set()
+                    assert released.wait(timeout=5)
+                    return super().build_context(name, context, widget)
+
+        async def release():
+            # Runs only if the event loop is not blocked by the render.
+            while not rendering.is_set():
+                await asyncio.sleep(0.01)
+            released.set()
+
+        async def main(executor):
+            html, _ = await asyncio.gather(
+                arender_form(SlowForm(), executor=executor),
+                release(),
+            )
+            return html
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert 'name="name"' in asyncio.run(main(executor))
+
+    def test_choices_loaded_in_calling_thread(self):
+        threads = []
+
+        def get_choices():
+            threads.append(threading.current_thread())
+            return [("r", "Red")]
+
+        class ColorForm(forms.Form):
+            color = forms.ChoiceField(choices=get_choices)
+
+        form = ColorForm()
+        threads.clear()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            render_form(form, executor=executor)
+        assert threads == [threading.current_thread()]
+
+    def test_async_bound_form(self):
+        loops = []
+
+        class CleanForm(BookForm):
+            def clean(self):
+                try:
+                    loops.append(asyncio.get_running_loop())
+                except RuntimeError:
+                    loops.append(None)
+                return super().clean()
+
+        form = CleanForm({"title": "Title"})
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            html = asyncio.run(arender_form(form, executor=executor))
+        assert loops == [None]
+        assert html == render_form(form)
+
+    def test_connections_closed(self, monkeypatch):
+        threads = []
+        monkeypatch.setattr(
+            connections,
+            "close_all",
+            lambda: threads.append(threading.current_thread())
+        )
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            render_form(BookForm(), executor=executor)
+        assert len(threads) == 3
+        assert threading.current_thread() not in threads
+
+
+class TestRenderFormset:
+    def test_render(self):
+        BookFormSet = forms.formset_factory(BookForm, extra=3)
+        formset = BookFormSet(initial=[{"title": "Dune"}])
+        html = render_formset(formset, fields=["title", "pages"], title={"placeholder": "Title"})
+        assert 'name="form-0-title"' in html
+        assert 'value="Dune"' in html
+        assert 'name="form-2-pages"' in html
+        assert html.count('placeholder="Title"') == 4
+
+    def test_same_as_render_form(self):
+        BookFormSet = forms.formset_factory(BookForm, extra=2)
+        expected = "".join(
+            render_form(form, author={"_style": "dark"})
+            for form in BookFormSet().forms
+        )
+        assert render_formset(BookFormSet(), author={"_style": "dark"}) == expected
+
+    def test_errors(self):
+        class InvalidBookForm(BookForm):
+            error_css_class = "invalid"
+
+        BookFormSet = forms.formset_factory(InvalidBookForm, extra=0)
+        formset = BookFormSet({
+            "form-TOTAL_FORMS": "2",
+            "form-INITIAL_FORMS": "0",
+            "form-0-title": "Dune",
+            "form-0-author": "Frank Herbert",
+            "form-0-pages": "412",
+            "form-1-title": "Solaris",
+            "form-1-author": "Stanislaw Lem",
+            "form-1-pages": "0",
+        })
+        html = render_formset(formset, fields=["pages"])
+        expected = "".join(render_form(form, fields=["pages"]) for form in formset.forms)
+        assert html == expected
+        assert html.count('<div class="invalid">') == 1
+
+    def test_own_widgets(self):
+        BookFormSet = forms.formset_factory(BookForm, extra=3)
+        formset = BookFormSet()
+        render_formset(formset)
+        for form in formset.forms:
+            assert get_bound_field(form, "title").widget is form.fields["title"].widget
+
+    def test_can_delete_extra(self):
+        BookFormSet = forms.formset_factory(
+            BookForm,
+            extra=2,
+            can_delete=True,
+            can_delete_extra=False
+        )
+        formset = BookFormSet(initial=[{"title": "Dune"}])
+        html = render_formset(formset)
+        assert 'name="form-0-DELETE"' in html
+        assert 'name="form-1-DELETE"' not in html
+        assert html == "".join(render_form(form) for form in formset.forms)
+
+    def test_per_row_choices(self):
+        class RowForm(forms.Form):
+            choice = forms.ChoiceField()
+
+            def __init__(self, *args, row, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.fields["choice"].choices = [(str(row), "row{}".format(row))]
+                self.fields["choice"].widget.attrs["data-row"] = row
+
+        class BaseRowFormSet(forms.BaseFormSet):
+            def get_form_kwargs(self, index):
+                return {"row": index}
+
+        RowFormSet = forms.formset_factory(RowForm, formset=BaseRowFormSet, extra=3)
+        html = render_formset(RowFormSet())
+        for row in range(3):
+            assert '<option value="{0}">row{0}</option>'.format(row) in html
+            assert 'data-row="{}"'.format(row) in html
+
+    def test_lazy_choices(self):
+        calls = []
+
+        def get_choices():
+            calls.append(None)
+            return [("r", "Red"), ("g", "Green")]
+
+        class ColorForm(forms.Form):
+            color = forms.ChoiceField(choices=get_choices)
+
+        ColorFormSet = forms.formset_factory(ColorForm, extra=5)
+        formset = ColorFormSet()
+        calls.clear()
+
+        html = render_formset(formset)
+        assert html.count('<option value="g">Green</option>') == 5
+        assert len(calls) == 1
+
+    def test_empty(self):
+        BookFormSet = forms.formset_factory(BookForm, extra=0)
+        assert render_formset(BookFormSet()) == ""
@@ -0,0 +1,92 @@
+from django import forms
+from django.forms.renderers import DjangoTemplates, get_default_renderer
+
+from paper_forms.boundfield import BoundField, get_bound_field
+from paper_forms.composer import BaseComposer
+from paper_forms.session import RenderSession, get_render_session
+
+
+class TestRenderSession:
+    def test_composer(self):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+            class Composer(BaseComposer):
+                pass
+
+        session = get_render_session(MyForm())
+        assert isinstance(session.composer, MyForm.Composer)
+
+    def test_default_renderer(self):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+        assert get_render_session(MyForm()).renderer is get_default_renderer()
+
+    def test_composer_renderer(self):
+        renderer = DjangoTemplates()
+
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+            class Composer(BaseComposer):
+                pass
+
+        MyForm.Composer.renderer = renderer
+        assert get_render_session(MyForm()).renderer is renderer
+
+    def test_css_classes_cache(self):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+        form = MyForm()
+        session = get_render_session(form)
+        assert session.css_classes_cache is session.composer.css_classes_cache[MyForm]
+        assert get_render_session(MyForm()).css_classes_cache is session.css_classes_cache
+
+    def test_instance_override(self):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+        form = MyForm()
+        form.error_css_class = "invalid"
+        assert get_render_session(form).css_classes_cache is None
+
+
+class TestGetRenderSession:
+    def test_same_form(self):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+        form = MyForm()
+        assert get_render_session(form) is get_render_session(form)
+
+    def test_different_forms(self):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+        assert get_render_session(MyForm()) is not get_render_session(MyForm())
+
+    def test_shared_by_fields(self):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+            email = forms.EmailField()
+
+        form = MyForm()
+        session = get_render_session(form)
+        assert get_bound_field(form, "name").session is session
+        assert get_bound_field(form, "email").session is session
+
+    def test_other_composer(self):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+        class Composer(BaseComposer):
+            pass
+
+        form = MyForm()
+        composer = Composer()
+        bf = BoundField(form, form.fields["name"], "name", composer)
+        assert isinstance(bf.session, RenderSession)
+        assert bf.session is not get_render_session(form)
+        assert bf.session.composer is composer
@@ -0,0 +1,79 @@
+import pytest
+from django import forms
+
+from paper_forms.boundfield import BoundField, get_bound_field
+from paper_forms.cache import LocMemFragmentCache
+from paper_forms.composer import BaseComposer
+from paper_forms.signals import field_rendered
+
+
+@pytest.fixture
+def events():
+    events = []
+
+    def receiver(**kwargs):
+        events.append(kwargs)
+
+    field_rendered.connect(receiver)
+    yield events
+    field_rendered.disconnect(receiver)
+
+
+class TestFieldRendered:
+    def test_no_receivers(self):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+        html = get_bound_field(MyForm(), "name").as_widget()
+        assert html == '<input type="text" name="name" required id="id_name">'
+
+    def test_send(self, events):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+            class Composer(BaseComposer):
+                pass
+
+        bf = get_bound_field(MyForm(), "name")
+        bf.as_widget()
+
+        assert len(events) == 1
+        event = events[0]
+        assert event["sender"] is MyForm.Composer
+        assert event["bound_field"] is bf
+        assert event["template_name"] == "django/forms/widgets/text.html"
+        assert event["cache_hit"] is None
+        assert set(event["timings"]) == {"composer", "widget", "context", "render"}
+
+    def test_composer_time_reported_once(self, events):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+        bf = get_bound_field(MyForm(), "name")
+        bf.as_widget()
+        bf.as_widget()
+
+        assert "composer" in events[0]["timings"]
+        assert "composer" not in events[1]["timings"]
+
+    def test_without_composer_time(self, events):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+        form = MyForm()
+        BoundField(form, form.fields["name"], "name", BaseComposer()).as_widget()
+        assert set(events[0]["timings"]) == {"widget", "context", "render"}
+
+    def test_cache_hit(self, events):
+        class MyForm(forms.Form):
+            name = forms.CharField()
+
+            class Composer(BaseComposer):
+                fragment_cache = LocMemFragmentCache()
+
+        get_bound_field(MyForm(), "name").as_widget()
+        get_bound_field(MyForm(), "name").as_widget()
+
+        assert events[0]["cache_hit"] is False
+        assert events[1]["cache_hit"] is True
+        assert set(events[1]["timings"]) == {"composer", "widget"}
@@ -0,0 +1,222 @@
+from pathlib import Path
+
+import pytest
+from django import forms
+from django.forms.renderers import Jinja2, TemplatesSetting
+from django.template import engines
+from django.test import override_settings
+from django.utils.autoreload import file_changed
+
+from paper_forms.composer import BaseComposer
+from paper_forms.utils import (
+    LazyContext,
+    clear_renderer_cache,
+    get_composer,
+    get_renderer,
+    split_attr_name,
+    split_attrs,
+)
+
+
+class CustomComposer(BaseComposer):
+    pass
+
+
+CUSTOM_COMPOSER = f"{__name__}.CustomComposer"
+
+
+class TestGetComposer:
+    def test_default(self):
+        composer = get_composer(forms.Form())
+        assert type(composer) is BaseComposer
+
+    def test_form_composer(self):
+        class MyForm(forms.Form):
+            class Composer(BaseComposer):
+                pass
+
+        composer = get_composer(MyForm())
+        assert isinstance(composer, MyForm.Composer)
+        assert get_composer(MyForm()) is composer
+
+    def test_inherited_composer(self):
+        class MyForm(forms.Form):
+            class Composer(BaseComposer):
+                pass
+
+        class ChildForm(MyForm):
+            pass
+
+        composer = get_composer(ChildForm())
+        assert isinstance(composer, MyForm.Composer)
+
+    def test_subclass_override(self):
+        class MyForm(forms.Form):
+            class Composer(BaseComposer):
+                pass
+
+        class ChildForm(MyForm):
+            class Composer(BaseComposer):
+                pass
+
+        assert isinstance(get_composer(MyForm()), MyForm.Composer)
+        assert isinstance(get_composer(ChildForm()), ChildForm.Composer)
+
+    def test_override_settings(self):
+        form = forms.Form()
+        assert type(get_composer(form)) is BaseComposer
+
+        with override_settings(PAPER_FORMS_DEFAULT_COMPOSER=CUSTOM_COMPOSER):
+            assert isinstance(get_composer(form), CustomComposer)
+
+        assert type(get_composer(form)) is BaseComposer
+
+    def test_conf(self, paper_conf):
+        form = forms.Form()
+        assert type(get_composer(form)) is BaseComposer
+
+        paper_conf.DEFAULT_COMPOSER = CUSTOM_COMPOSER
+        assert isinstance(get_composer(form), CustomComposer)
+
+
+class TestGetRenderer:
+    def test_none(self):
+        assert get_renderer(None) is None
+
+    def test_instance(self):
+        renderer = Jinja2()
+        assert get_renderer(renderer) is renderer
+
+    def test_string(self):
+        renderer = get_renderer("django.forms.renderers.Jinja2")
+        assert isinstance(renderer, Jinja2)
+        assert get_renderer("django.forms.renderers.Jinja2") is renderer
+
+    def test_class(self):
+        renderer = get_renderer(TemplatesSetting)
+        assert isinstance(renderer, TemplatesSetting)
+        assert get_renderer(TemplatesSetting) is renderer
+
+    def test_clear_cache(self):
+        renderer = get_renderer(Jinja2)
+        clear_renderer_cache()
+        assert get_renderer(Jinja2) is not renderer
+
+    def test_setting_changed(self):
+        renderer = get_renderer(Jinja2)
+        with override_settings(FORM_RENDERER="django.forms.renderers.Jinja2"):
+            assert get_renderer(Jinja2) is not renderer
+
+    def test_template_changed(self):
+        renderer = get_renderer(Jinja2)
+        file_changed.send(sender=None, file_path=Path("templates/index.html"))
+        assert get_renderer(Jinja2) is not renderer
+
+    def test_python_file_changed(self):
+        renderer = get_renderer(Jinja2)
+        file_changed.send(sender=None, file_path=Path("app/views.py"))
+        assert get_renderer(Jinja2) is renderer
+
+
+class TestLazyContext:
+    def get_context(self, calls):
+        context = LazyContext(widget="text")
+
+        def factory():
+            calls.append("label")
+            return "Name"
+
+        context.set_lazy("label", factory)
+        return context
+
+    def test_lazy(self):
+        calls = []
+        context = self.get_context(calls)
+        assert "label" in context
+        assert len(context) == 2
+        assert calls == []
+
+        assert context["label"] == "Name"
+        assert context.get("label") == "Name"
+        assert calls == ["label"]
+
+    def test_missing(self):
+        context = self.get_context([])
+        assert context.get("missing") is None
+        with pytest.raises(KeyError):
+            context["missing"]
+
+    def test_override(self):
+        calls = []
+        context = self.get_context(calls)
+        context["label"] = "Title"
+        assert context["label"] == "Title"
+        assert calls == []
+
+    def test_delete(self):
+        calls = []
+        context = self.get_context(calls)
+        del context["label"]
+        assert "label" not in context
+        assert calls == []
+
+    def test_bulk_operations(self):
+        context = self.get_context([])
+        assert context == {"widget": "text", "label": "Name"}
+        assert dict(context) == {"widget": "text", "label": "Name"}
+        assert {**context} == {"widget": "text", "label": "Name"}
+        assert sorted(context) == ["label", "widget"]
+
+    def test_setdefault(self):
+        calls = []
+        context = self.get_context(calls)
+        assert context.setdefault("label", "Title") == "Name"
+        assert context.setdefault("help_text", "Help") == "Help"
+        assert calls == ["label"]
+
+    def test_pop(self):
+        context = self.get_context([])
+        assert context.pop("label") == "Name"
+        assert context == {"widget": "text"}
+
+    def test_django_template(self):
+        calls = []
+        context = self.get_context(calls)
+        template = engines["django"].from_string("{{ widget }}")
+        assert template.render(context) == "text"
+        assert calls == []
+
+        template = engines["django"].from_string("{{ label }}")
+        assert template.render(context) == "Name"
+        assert calls == ["label"]
+
+    def test_jinja2_template(self):
+        template = engines["jinja2"].from_string("{{ widget }}: {{ label }}")
+        assert template.render(self.get_context([])) == "text: Name"
+
+
+class TestSplitAttrs:
+    def test_split_attr_name(self):
+        assert split_attr_name("placeholder") == (False, "placeholder")
+        assert split_attr_name("data__field__id") == (False, "data-field-id")
+        assert split_attr_name("_style") == (True, "style")
+        assert split_attr_name("_data__style") == (True, "data__style")
+        assert split_attr_name("label") == (True, "label")
+
+    def test_split_attrs(self):
+        widget_attrs, context = split_attrs({
+            "placeholder": "Name",
+            "data__id": "42",
+            "_style": "dark",
+            "label": "Your Name",
+            "_label": "This will be overriden",
+            "help_text": None,
+        })
+        assert widget_attrs == {
+            "placeholder": "Name",
+            "data-id": "42",
+        }
+        assert context == {
+            "style": "dark",
+            "label": "Your Name",
+        }
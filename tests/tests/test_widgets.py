@@ -0,0 +1,66 @@
+from django import forms
+
+from paper_forms.widgets import (
+    IsolatedWidget,
+    WidgetClassFactory,
+    WidgetPrototype,
+    get_widget_factory,
+)
+
+
+class TestGetWidgetFactory:
+    def test_class(self):
+        factory = get_widget_factory(forms.TextInput)
+        assert isinstance(factory, WidgetClassFactory)
+
+    def test_instance(self):
+        factory = get_widget_factory(forms.TextInput())
+        assert isinstance(factory, WidgetPrototype)
+
+    def test_multiwidget(self):
+        factory = get_widget_factory(forms.SplitDateTimeWidget())
+        assert isinstance(factory, IsolatedWidget)
+
+    def test_factory(self):
+        factory = IsolatedWidget(forms.TextInput())
+        assert get_widget_factory(factory) is factory
+
+
+class TestWidgetPrototype:
+    def test_attrs(self):
+        widget = forms.TextInput(attrs={"class": "input"})
+        factory = WidgetPrototype(widget)
+
+        clone1 = factory()
+        clone2 = factory()
+        clone1.attrs["placeholder"] = "Name"
+        assert clone1 is not clone2
+        assert clone2.attrs == {"class": "input"}
+        assert widget.attrs == {"class": "input"}
+
+    def test_choices(self):
+        widget = forms.Select(choices=[("r", "Red"), ("g", "Green")])
+        factory = WidgetPrototype(widget)
+
+        clone1 = factory()
+        clone2 = factory()
+        assert list(clone1.choices) == [("r", "Red"), ("g", "Green")]
+        assert clone1.choices is clone2.choices
+        assert clone1.choices is not widget.choices
+
+    def test_instance_attributes(self):
+        factory = WidgetPrototype(forms.TextInput())
+
+        clone1 = factory()
+        clone1.is_required = True
+        assert factory().is_required is False
+
+
+class TestIsolatedWidget:
+    def test_deepcopy(self):
+        widget = forms.SplitDateTimeWidget()
+        factory = IsolatedWidget(widget)
+
+        clone = factory()
+        assert clone is not widget
+        assert clone.widgets[0] is not widget.widgets[0]